@@ -253,8 +253,8 @@ class PersonalAssistant:
         if not calendar_manager.is_available():
             return "📅 Google Calendar is not set up yet. Use /calendar_setup for instructions."
         
-        today_events = calendar_manager.get_todays_events()
-        upcoming_events = calendar_manager.get_upcoming_events(hours=48)
+        # A single request covers today and tomorrow
+        today_events, tomorrow_events = await calendar_manager.aget_calendar_overview(hours=48)
         
         message = "📅 **Calendar Overview**\n\n"
         
@@ -264,7 +264,6 @@ class PersonalAssistant:
         else:
             message += "**Today:** No events scheduled"
         
-        tomorrow_events = [e for e in upcoming_events if e['start_time'].date() > datetime.now().date()]
         if tomorrow_events:
             message += f"\n\n**Tomorrow ({len(tomorrow_events)} events):**\n"
             message += calendar_manager.format_events_for_display(tomorrow_events[:5])
@@ -300,21 +299,21 @@ class PersonalAssistant:
         if not next_event:
             return "📅 No upcoming events in the next 24 hours."
         
-        if next_event['is_all_day']:
+        if next_event.is_all_day:
             time_str = "All day"
         else:
-            time_str = next_event['start_time'].strftime("%H:%M")
-            if next_event['start_time'].date() != datetime.now().date():
-                time_str = next_event['start_time'].strftime("%a %H:%M")
+            time_str = next_event.start_time.strftime("%H:%M")
+            if next_event.start_time.date() != datetime.now().date():
+                time_str = next_event.start_time.strftime("%a %H:%M")
         
         message = f"📅 **Next Event:**\n\n"
-        message += f"• {time_str}: {next_event['summary']}"
+        message += f"• {time_str}: {next_event.summary}"
         
-        if next_event['location']:
-            message += f"\n📍 {next_event['location']}"
+        if next_event.location:
+            message += f"\n📍 {next_event.location}"
         
-        if next_event['description']:
-            message += f"\n📝 {next_event['description'][:100]}..."
+        if next_event.description:
+            message += f"\n📝 {next_event.description[:100]}..."
         
         return message
     
@@ -3,7 +3,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, date
 import json
 import os
-from utils.timezone_helper import get_local_time_naive
+from utils.timezone_helper import get_local_time_naive, clear_user_timezone_cache
 
 
 @dataclass
@@ -83,6 +83,7 @@ class User:
     profile: UserProfile
     current_plan: Optional[DailyPlan] = None
     plan_history: List[DailyPlan] = None
+    persist: bool = True
     
     def __post_init__(self):
         if self.plan_history is None:
@@ -112,6 +113,8 @@ class User:
         """Update a user preference and save"""
         try:
             self.profile.preferences[key] = value
+            if key == "timezone":
+                clear_user_timezone_cache(self.profile.user_id)
             self.profile.last_updated = get_local_time_naive().isoformat()
             self.save()
             return True
@@ -132,7 +135,8 @@ class User:
         else:
             self.current_plan = DailyPlan.create(content, update_source)
         
-        self._save_current_plan()
+        if self.persist:
+            self._save_current_plan()
     
     def archive_current_plan(self):
         if self.current_plan:
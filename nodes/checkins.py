@@ -80,7 +80,7 @@ async def midday_checkin(state: AgentState) -> AgentState:
     
     # Get calendar context for next events
     calendar_manager = create_google_calendar_manager(user.profile.user_id)
-    next_event = calendar_manager.get_next_event()
+    next_event = await calendar_manager.aget_next_event()
     
     # Update context data
     context_data = state.get("context_data", {})
@@ -96,11 +96,11 @@ async def midday_checkin(state: AgentState) -> AgentState:
         
         next_event_info = ""
         if next_event:
-            if next_event['is_all_day']:
-                next_event_info = f"\n\nBy the way, you have '{next_event['summary']}' today."
+            if next_event.is_all_day:
+                next_event_info = f"\n\nBy the way, you have '{next_event.summary}' today."
             else:
-                next_event_time = next_event['start_time'].strftime("%H:%M")
-                next_event_info = f"\n\nBy the way, you have '{next_event['summary']}' coming up at {next_event_time}."
+                next_event_time = next_event.start_time.strftime("%H:%M")
+                next_event_info = f"\n\nBy the way, you have '{next_event.summary}' coming up at {next_event_time}."
         
         user_message = f"It's midday! Here's what we planned: {current_plan}. How's your day going so far?{next_event_info}"
         
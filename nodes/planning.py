@@ -26,7 +26,7 @@ async def morning_planning(state: AgentState) -> AgentState:
     
     # Get calendar context
     calendar_manager = create_google_calendar_manager(user.profile.user_id)
-    calendar_context = calendar_manager.get_calendar_context_for_planning()
+    calendar_context = await calendar_manager.aget_calendar_context_for_planning()
     
     # Add calendar context to state context_data
     context_data = state.get("context_data", {})
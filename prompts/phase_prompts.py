@@ -98,14 +98,14 @@ def get_midday_checkin_prompt(user_profile: UserProfile, context_data: Dict[str,
     next_event_context = ""
     if context_data.get("next_event"):
         next_event = context_data["next_event"]
-        if next_event['is_all_day']:
+        if next_event.is_all_day:
             next_event_context = f"""
-**Upcoming Event**: You have '{next_event['summary']}' scheduled for today. This might be a good time to think about any preparation needed or how to approach it gently.
+**Upcoming Event**: You have '{next_event.summary}' scheduled for today. This might be a good time to think about any preparation needed or how to approach it gently.
 """
         else:
-            event_time = next_event['start_time'].strftime("%H:%M")
+            event_time = next_event.start_time.strftime("%H:%M")
             next_event_context = f"""
-**Upcoming Event**: You have '{next_event['summary']}' at {event_time}. Consider if you need any transition time or preparation, and remember it's okay to take a moment to mentally prepare.
+**Upcoming Event**: You have '{next_event.summary}' at {event_time}. Consider if you need any transition time or preparation, and remember it's okay to take a moment to mentally prepare.
 """
     
     return f"""
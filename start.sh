@@ -25,6 +25,11 @@ else
     echo "✅ Dependencies already installed"
 fi
 
+# Pre-compile bytecode so startup and validate_setup.py skip parsing
+echo "⚙️  Compiling modules..."
+unset PYTHONDONTWRITEBYTECODE
+python3 -m compileall -q -j0 models utils nodes prompts main.py validate_setup.py
+
 # Check environment variables
 echo "🔐 Checking environment variables..."
 if [ ! -f ".env" ]; then
@@ -16,7 +16,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from models.user import User, UserProfile, DailyPlan
 from models.agent_state import AgentState, create_initial_state
-from utils.google_calendar import GoogleCalendarManager
+from utils.google_calendar import GoogleCalendarManager, CalendarEvent
 
 
 @pytest.fixture
@@ -73,42 +73,42 @@ def mock_calendar_events():
     """Sample calendar events for testing"""
     now = datetime.now()
     return [
-        {
-            'id': 'event1',
-            'summary': 'Morning Meeting',
-            'description': 'Team standup',
-            'start_time': now.replace(hour=9, minute=0),
-            'end_time': now.replace(hour=10, minute=0),
-            'is_all_day': False,
-            'location': 'Conference Room A',
-            'status': 'confirmed',
-            'url': 'https://calendar.google.com/event1',
-            'duration_minutes': 60
-        },
-        {
-            'id': 'event2',
-            'summary': 'Lunch Break',
-            'description': '',
-            'start_time': now.replace(hour=12, minute=0),
-            'end_time': now.replace(hour=13, minute=0),
-            'is_all_day': False,
-            'location': '',
-            'status': 'confirmed',
-            'url': 'https://calendar.google.com/event2',
-            'duration_minutes': 60
-        },
-        {
-            'id': 'event3',
-            'summary': 'All Day Event',
-            'description': 'Conference day',
-            'start_time': now.replace(hour=0, minute=0),
-            'end_time': now.replace(hour=23, minute=59),
-            'is_all_day': True,
-            'location': 'Convention Center',
-            'status': 'confirmed',
-            'url': 'https://calendar.google.com/event3',
-            'duration_minutes': None
-        }
+        CalendarEvent(
+            id='event1',
+            summary='Morning Meeting',
+            description='Team standup',
+            start_time=now.replace(hour=9, minute=0),
+            end_time=now.replace(hour=10, minute=0),
+            is_all_day=False,
+            location='Conference Room A',
+            status='confirmed',
+            url='https://calendar.google.com/event1',
+            duration_minutes=60
+        ),
+        CalendarEvent(
+            id='event2',
+            summary='Lunch Break',
+            description='',
+            start_time=now.replace(hour=12, minute=0),
+            end_time=now.replace(hour=13, minute=0),
+            is_all_day=False,
+            location='',
+            status='confirmed',
+            url='https://calendar.google.com/event2',
+            duration_minutes=60
+        ),
+        CalendarEvent(
+            id='event3',
+            summary='All Day Event',
+            description='Conference day',
+            start_time=now.replace(hour=0, minute=0),
+            end_time=now.replace(hour=23, minute=59),
+            is_all_day=True,
+            location='Convention Center',
+            status='confirmed',
+            url='https://calendar.google.com/event3',
+            duration_minutes=None
+        )
     ]
 
 
@@ -128,6 +128,11 @@ def mock_calendar_manager(mock_calendar_events):
         'next_event': mock_calendar_events[0],
         'calendar_summary': "• 09:00 - 10:00: Morning Meeting (Conference Room A)\n• 12:00 - 13:00: Lunch Break\n• All day: All Day Event (Convention Center)"
     }
+    mock_manager.aget_todays_events.return_value = mock_calendar_events
+    mock_manager.aget_next_event.return_value = mock_calendar_events[0]
+    mock_manager.aget_calendar_context_for_planning.return_value = (
+        mock_manager.get_calendar_context_for_planning.return_value
+    )
     return mock_manager
 
 
@@ -149,6 +154,43 @@ def mock_telegram_context():
     return Mock()
 
 
+class FakeSchedulerState:
+    """In-memory stand-in for SchedulerState that never touches disk"""
+
+    def __init__(self, user_id: str = "test_user"):
+        self.user_id = user_id
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def update(self, updates):
+        self.data.update(updates)
+
+    def flush(self):
+        pass
+
+    async def aset(self, key, value):
+        self.set(key, value)
+
+    async def aupdate(self, updates):
+        self.update(updates)
+
+    async def aflush(self):
+        pass
+
+
+@pytest.fixture
+def no_io_scheduler(monkeypatch):
+    """Swap SchedulerState and TelegramBotInterface for no-IO fakes"""
+    monkeypatch.setattr('utils.scheduler.SchedulerState', FakeSchedulerState)
+    monkeypatch.setattr('utils.scheduler.TelegramBotInterface', Mock(get_instance=AsyncMock))
+    return FakeSchedulerState
+
+
 # Utility functions for tests
 def assert_agent_state_valid(state: AgentState):
     """Assert that an agent state is valid"""
@@ -169,15 +211,15 @@ def create_test_calendar_event(summary: str, start_hour: int, duration_minutes:
     start_time = now.replace(hour=start_hour, minute=0, second=0, microsecond=0)
     end_time = start_time + timedelta(minutes=duration_minutes)
     
-    return {
-        'id': f'test_{summary.lower().replace(" ", "_")}',
-        'summary': summary,
-        'description': f'Test event: {summary}',
-        'start_time': start_time,
-        'end_time': end_time,
-        'is_all_day': is_all_day,
-        'location': 'Test Location',
-        'status': 'confirmed',
-        'url': f'https://calendar.google.com/{summary}',
-        'duration_minutes': duration_minutes if not is_all_day else None
-    }
\ No newline at end of file
+    return CalendarEvent(
+        id=f'test_{summary.lower().replace(" ", "_")}',
+        summary=summary,
+        description=f'Test event: {summary}',
+        start_time=start_time,
+        end_time=end_time,
+        is_all_day=is_all_day,
+        location='Test Location',
+        status='confirmed',
+        url=f'https://calendar.google.com/{summary}',
+        duration_minutes=duration_minutes if not is_all_day else None
+    )
\ No newline at end of file
@@ -24,6 +24,19 @@ class TestTelegramBotInterface:
             assert bot_interface.message_handler is None
             assert bot_interface.command_handlers == {}
     
+    @patch('utils.telegram_bot.Bot')
+    def test_get_instance_is_shared(self, mock_bot):
+        """Test that get_instance builds one interface and Bot per process"""
+        with patch.dict('os.environ', {
+            'TELEGRAM_TOKEN': 'test_token',
+            'TELEGRAM_CHAT_ID': 'test_chat_id'
+        }), patch.object(TelegramBotInterface, '_instance', None):
+            first = TelegramBotInterface.get_instance()
+            second = TelegramBotInterface.get_instance()
+            
+            assert first is second
+            mock_bot.assert_called_once_with(token='test_token')
+    
     def test_telegram_bot_missing_env_vars(self):
         """Test Telegram bot initialization with missing environment variables"""
         with patch.dict('os.environ', {}, clear=True):
@@ -181,6 +194,80 @@ class TestTelegramBotInterface:
             result = await bot_interface.send_message("Test message")
             
             assert result is False
+    
+    @pytest.mark.asyncio
+    @patch('utils.telegram_bot.Bot')
+    async def test_send_message_limits_concurrency(self, mock_bot):
+        """Test that at most MAX_CONCURRENT_SENDS messages are in flight at once"""
+        import asyncio
+        
+        with patch.dict('os.environ', {
+            'TELEGRAM_TOKEN': 'test_token',
+            'TELEGRAM_CHAT_ID': 'test_chat_id'
+        }):
+            bot_interface = TelegramBotInterface()
+            in_flight, peak = 0, 0
+            
+            async def slow_send(**kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+            
+            bot_interface.bot.send_message = AsyncMock(side_effect=slow_send)
+            
+            results = await asyncio.gather(*(
+                bot_interface.send_message(f"Message {i}") for i in range(10)
+            ))
+            
+            assert all(results)
+            assert peak == TelegramBotInterface.MAX_CONCURRENT_SENDS
+    
+    @pytest.mark.asyncio
+    @patch('utils.telegram_bot.asyncio.sleep', new_callable=AsyncMock)
+    @patch('utils.telegram_bot.Bot')
+    async def test_send_message_retries_with_backoff(self, mock_bot, mock_sleep):
+        """Test that transient failures are retried with growing delays"""
+        from telegram.error import TimedOut, RetryAfter
+        
+        with patch.dict('os.environ', {
+            'TELEGRAM_TOKEN': 'test_token',
+            'TELEGRAM_CHAT_ID': 'test_chat_id'
+        }):
+            bot_interface = TelegramBotInterface()
+            bot_interface.bot.send_message = AsyncMock(
+                side_effect=[TimedOut(), TimedOut(), RetryAfter(5), None]
+            )
+            
+            result = await bot_interface.send_message("Test message")
+            
+            assert result is True
+            assert bot_interface.bot.send_message.call_count == 4
+            assert [c.args[0] for c in mock_sleep.await_args_list] == [1.0, 2.0, 5]
+    
+    @pytest.mark.asyncio
+    @patch('utils.telegram_bot.asyncio.sleep', new_callable=AsyncMock)
+    @patch('utils.telegram_bot.Bot')
+    async def test_send_message_gives_up_after_attempts(self, mock_bot, mock_sleep):
+        """Test that a send reports failure once its retries are used up"""
+        from telegram.error import BadRequest, NetworkError
+        
+        with patch.dict('os.environ', {
+            'TELEGRAM_TOKEN': 'test_token',
+            'TELEGRAM_CHAT_ID': 'test_chat_id'
+        }):
+            bot_interface = TelegramBotInterface()
+            bot_interface.bot.send_message = AsyncMock(side_effect=NetworkError("down"))
+            
+            assert await bot_interface.send_message("Test message") is False
+            assert bot_interface.bot.send_message.call_count == TelegramBotInterface.SEND_ATTEMPTS
+            
+            # Requests Telegram rejects outright aren't retried
+            bot_interface.bot.send_message = AsyncMock(side_effect=BadRequest("chat not found"))
+            
+            assert await bot_interface.send_message("Test message") is False
+            bot_interface.bot.send_message.assert_awaited_once()
 
 
 @pytest.mark.telegram
@@ -261,14 +348,13 @@ class TestTelegramIntegrationWithMain:
         # Setup calendar manager mock
         mock_manager = Mock()
         mock_manager.is_available.return_value = True
-        mock_manager.get_todays_events.return_value = [
+        mock_manager.aget_calendar_overview = AsyncMock(return_value=([
             {
                 'summary': 'Test Meeting',
                 'start_time': Mock(),
                 'is_all_day': False
             }
-        ]
-        mock_manager.get_upcoming_events.return_value = []
+        ], []))
         mock_manager.format_events_for_display.return_value = "• 09:00 - 10:00: Test Meeting"
         mock_calendar_manager.return_value = mock_manager
         
@@ -312,7 +398,7 @@ class TestTelegramUtilityFunctions:
         
         mock_bot = Mock()
         mock_bot.send_message = AsyncMock(return_value=True)
-        mock_telegram_interface.return_value = mock_bot
+        mock_telegram_interface.get_instance.return_value = mock_bot
         
         result = await send_telegram_message("Test message", "test_chat_id")
         
@@ -10,6 +10,7 @@ from models.agent_state import create_initial_state
 from nodes.planning import morning_planning, nighttime_planning
 from nodes.checkins import morning_checkin, midday_checkin, evening_checkin
 from nodes.interrupts import handle_interrupt, should_interrupt
+from utils.google_calendar import GoogleCalendarManager
 
 
 @pytest.mark.integration
@@ -207,15 +208,16 @@ class TestWorkflowStateTransitions:
             mock_user_checkins.return_value = mock_user
             
             # Setup calendar manager
-            mock_calendar_manager = Mock()
-            mock_calendar_manager.get_calendar_context_for_planning.return_value = {
+            # The nodes await the async accessors, which spec makes AsyncMocks
+            mock_calendar_manager = Mock(spec=GoogleCalendarManager)
+            mock_calendar_manager.aget_calendar_context_for_planning.return_value = {
                 'has_calendar_access': True,
                 'today_events_count': 0,
                 'today_events': [],
                 'next_event': None,
                 'calendar_summary': "No events today"
             }
-            mock_calendar_manager.get_next_event.return_value = None
+            mock_calendar_manager.aget_next_event.return_value = None
             mock_cal_planning.return_value = mock_calendar_manager
             mock_cal_checkins.return_value = mock_calendar_manager
             
@@ -266,8 +268,8 @@ class TestWorkflowWithCalendar:
         """Test morning planning with calendar events"""
         # Setup mocks
         mock_user.return_value = Mock(profile=sample_user_profile)
-        calendar_manager = Mock()
-        calendar_manager.get_calendar_context_for_planning.return_value = {
+        calendar_manager = Mock(spec=GoogleCalendarManager)
+        calendar_manager.aget_calendar_context_for_planning.return_value = {
             'has_calendar_access': True,
             'today_events_count': 3,
             'today_events': mock_calendar_events,
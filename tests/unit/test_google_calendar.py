@@ -58,10 +58,11 @@ class TestGoogleCalendarManager:
         
         processed = manager._process_event(raw_event)
         
-        assert processed['summary'] == 'Test Meeting'
-        assert processed['is_all_day'] is False
-        assert processed['duration_minutes'] == 60
-        assert processed['location'] == 'Room 123'
+        assert processed.summary == 'Test Meeting'
+        assert processed.is_all_day is False
+        assert processed.duration_minutes == 60
+        assert processed.location == 'Room 123'
+        assert processed.to_dict()['url'] == 'https://calendar.google.com/event'
     
     @freeze_time("2024-01-15 10:00:00")
     def test_process_event_all_day(self):
@@ -78,9 +79,9 @@ class TestGoogleCalendarManager:
         
         processed = manager._process_event(raw_event)
         
-        assert processed['summary'] == 'All Day Event'
-        assert processed['is_all_day'] is True
-        assert processed['duration_minutes'] is None
+        assert processed.summary == 'All Day Event'
+        assert processed.is_all_day is True
+        assert processed.duration_minutes is None
     
     def test_process_invalid_event(self):
         """Test processing an invalid event"""
@@ -95,24 +96,140 @@ class TestGoogleCalendarManager:
         processed = manager._process_event(invalid_event)
         assert processed is None
     
-    @patch.object(GoogleCalendarManager, 'get_todays_events')
-    @patch.object(GoogleCalendarManager, 'get_next_event')
-    def test_get_calendar_context_for_planning(self, mock_next_event, mock_today_events, mock_calendar_events):
+    @freeze_time("2024-01-15 10:30:00")
+    @patch.object(GoogleCalendarManager, '_fetch_window')
+    def test_get_calendar_context_for_planning(self, mock_fetch_window):
         """Test getting calendar context for planning"""
+        from tests.conftest import create_test_calendar_event
+        
         manager = GoogleCalendarManager("test_user")
         manager.service = Mock()  # Mock that service is available
         
-        mock_today_events.return_value = mock_calendar_events
-        mock_next_event.return_value = mock_calendar_events[0]
+        tomorrow_event = create_test_calendar_event("Early Standup", 8)
+        tomorrow_event.start_time += timedelta(days=1)
+        tomorrow_event.end_time += timedelta(days=1)
+        events = [
+            create_test_calendar_event("Morning Meeting", 9),
+            create_test_calendar_event("Lunch Break", 12),
+            tomorrow_event
+        ]
+        mock_fetch_window.return_value = events
         
         context = manager.get_calendar_context_for_planning()
         
         assert context['has_calendar_access'] is True
-        assert context['today_events_count'] == 3
-        assert context['today_events'] == mock_calendar_events
-        assert context['next_event'] == mock_calendar_events[0]
+        assert context['today_events_count'] == 2
+        assert context['today_events'] == events[:2]
+        assert context['next_event'] == events[1]
         assert 'calendar_summary' in context
-
+        
+        # Today's events and the next event come from a single API call
+        mock_fetch_window.assert_called_once()
+    
+    @pytest.mark.asyncio
+    @patch.object(GoogleCalendarManager, '_fetch_window')
+    async def test_aget_calendar_context_for_planning(self, mock_fetch_window):
+        """Test async planning context matches the sync version"""
+        manager = GoogleCalendarManager("test_user")
+        manager.service = Mock()
+        mock_fetch_window.return_value = []
+        
+        context = await manager.aget_calendar_context_for_planning()
+        
+        assert context['has_calendar_access'] is True
+        assert context['today_events_count'] == 0
+        assert context['next_event'] is None
+        mock_fetch_window.assert_called_once()
+    
+    @freeze_time("2024-01-15 10:30:00")
+    @patch.object(GoogleCalendarManager, '_fetch_window')
+    def test_get_calendar_overview(self, mock_fetch_window):
+        """Test that today's and tomorrow's events come from one request"""
+        from tests.conftest import create_test_calendar_event
+        
+        manager = GoogleCalendarManager("test_user")
+        manager.service = Mock()
+        
+        tomorrow_event = create_test_calendar_event("Early Standup", 8)
+        tomorrow_event.start_time += timedelta(days=1)
+        tomorrow_event.end_time += timedelta(days=1)
+        events = [create_test_calendar_event("Morning Meeting", 9), tomorrow_event]
+        mock_fetch_window.return_value = events
+        
+        today_events, later_events = manager.get_calendar_overview(hours=48)
+        
+        assert today_events == events[:1]
+        assert later_events == events[1:]
+        mock_fetch_window.assert_called_once_with(
+            datetime(2024, 1, 15, 0, 0), datetime(2024, 1, 17, 10, 30)
+        )
+    
+    def test_fetch_window_sends_rfc3339_times(self):
+        """Test that request bounds carry their UTC offset"""
+        from datetime import timezone
+        
+        manager = GoogleCalendarManager("test_user")
+        manager.service = Mock()
+        list_mock = manager.service.events.return_value.list
+        list_mock.return_value.execute.return_value = {'items': []}
+        
+        pacific = timezone(timedelta(hours=-8))
+        manager._fetch_window(
+            datetime(2024, 1, 15, 0, 0, tzinfo=pacific),
+            datetime(2024, 1, 15, 23, 59, 59, 999999, tzinfo=pacific)
+        )
+        
+        kwargs = list_mock.call_args.kwargs
+        assert kwargs['timeMin'] == '2024-01-15T00:00:00-08:00'
+        assert kwargs['timeMax'] == '2024-01-15T23:59:59-08:00'
+    
+    def test_todays_events_are_cached(self):
+        """Test that repeated calls within the TTL reuse the first API response"""
+        manager = GoogleCalendarManager("test_user")
+        manager.service = Mock()
+        manager.service.events.return_value.list.return_value.execute.return_value = {'items': []}
+        
+        manager.get_todays_events()
+        manager.get_todays_events()
+        
+        assert manager.service.events.return_value.list.return_value.execute.call_count == 1
+    
+    def test_fetches_for_one_user_share_a_lock(self):
+        """Test that managers for the same user serialize their API calls"""
+        manager1 = GoogleCalendarManager("test_user")
+        manager2 = GoogleCalendarManager("test_user")
+        
+        assert manager1._lock is manager2._lock
+        assert GoogleCalendarManager("other_user")._lock is not manager1._lock
+    
+    def test_concurrent_fetches_do_not_overlap(self):
+        """Test that threads using one service never call execute at the same time"""
+        import threading
+        import time as time_module
+        
+        manager = GoogleCalendarManager("test_user")
+        manager.service = Mock()
+        active, overlaps = [0], []
+        
+        def execute():
+            active[0] += 1
+            overlaps.append(active[0] > 1)
+            time_module.sleep(0.01)
+            active[0] -= 1
+            return {'items': []}
+        
+        manager.service.events.return_value.list.return_value.execute.side_effect = execute
+        threads = [
+            threading.Thread(target=manager.get_upcoming_events, args=(hours,))
+            for hours in (1, 2, 3, 4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(overlaps) == 4
+        assert not any(overlaps)
 
 @pytest.mark.calendar
 class TestGoogleCalendarIntegration:
@@ -133,8 +250,8 @@ class TestGoogleCalendarIntegration:
             next_event = manager.get_next_event()
             # next_event can be None if no upcoming events
             if next_event:
-                assert 'summary' in next_event
-                assert 'start_time' in next_event
+                assert next_event.summary
+                assert next_event.start_time
         else:
             pytest.skip("Google Calendar not configured for testing")
 
@@ -148,10 +265,10 @@ class TestCalendarUtilityFunctions:
         
         event = create_test_calendar_event("Test Meeting", 14, 90)
         
-        assert event['summary'] == "Test Meeting"
-        assert event['start_time'].hour == 14
-        assert event['duration_minutes'] == 90
-        assert event['is_all_day'] is False
+        assert event.summary == "Test Meeting"
+        assert event.start_time.hour == 14
+        assert event.duration_minutes == 90
+        assert event.is_all_day is False
     
     def test_create_all_day_test_event(self):
         """Test creating all-day test event"""
@@ -159,16 +276,30 @@ class TestCalendarUtilityFunctions:
         
         event = create_test_calendar_event("Conference", 0, is_all_day=True)
         
-        assert event['summary'] == "Conference"
-        assert event['is_all_day'] is True
-        assert event['duration_minutes'] is None
+        assert event.summary == "Conference"
+        assert event.is_all_day is True
+        assert event.duration_minutes is None
+    
+    def test_factory_reuses_available_manager(self):
+        """Test that authorized managers are cached per user"""
+        from utils import google_calendar
+        
+        with patch('utils.google_calendar.GoogleCalendarManager') as mock_manager_class, \
+             patch.dict(google_calendar._MANAGER_CACHE, clear=True):
+            mock_manager_class.return_value.is_available.return_value = True
+            
+            manager1 = google_calendar.create_google_calendar_manager("test_user")
+            manager2 = google_calendar.create_google_calendar_manager("test_user")
+            
+            assert manager1 is manager2
+            mock_manager_class.assert_called_once_with("test_user")
 
 
 @pytest.mark.unit
 class TestCalendarErrorHandling:
     """Test error handling in calendar functionality"""
     
-    @patch('utils.google_calendar.Credentials.from_authorized_user_file')
+    @patch('google.oauth2.credentials.Credentials.from_authorized_user_file')
     def test_invalid_token_handling(self, mock_credentials):
         """Test handling of invalid token file"""
         mock_credentials.side_effect = ValueError("Invalid token format")
@@ -194,15 +325,14 @@ class TestCalendarErrorHandling:
         assert manager.get_next_event() is None
         assert not manager.is_available()
     
-    @patch.object(GoogleCalendarManager, 'get_todays_events')
-    def test_calendar_context_without_access(self, mock_today_events):
+    def test_calendar_context_without_access(self):
         """Test calendar context when no access is available"""
         manager = GoogleCalendarManager("test_user")
         manager.service = None
-        mock_today_events.return_value = []
         
         context = manager.get_calendar_context_for_planning()
         
         assert context['has_calendar_access'] is False
         assert context['today_events_count'] == 0
+        assert context['next_event'] is None
         assert context['calendar_summary'] == "No events today"
\ No newline at end of file
@@ -4,7 +4,6 @@ Unit tests for core model classes
 import pytest
 from datetime import datetime
 from freezegun import freeze_time
-from unittest.mock import patch
 
 from models.user import User, UserProfile, DailyPlan
 from models.agent_state import (
@@ -90,32 +89,30 @@ class TestUser:
     
     def test_update_plan(self, sample_user_profile):
         """Test updating user plan"""
-        with patch('models.user.User._save_current_plan'):  # Mock file operations
-            user = User(profile=sample_user_profile)
-            
-            # First plan
-            user.update_plan("First plan", "morning_planning")
-            assert user.current_plan is not None
-            assert user.current_plan.content == "First plan"
-            
-            # Update plan
-            user.update_plan("Updated plan", "midday_checkin")
-            assert user.current_plan.content == "Updated plan"
-            assert user.current_plan.metadata["update_source"] == "midday_checkin"
+        user = User(profile=sample_user_profile, persist=False)
+        
+        # First plan
+        user.update_plan("First plan", "morning_planning")
+        assert user.current_plan is not None
+        assert user.current_plan.content == "First plan"
+        
+        # Update plan
+        user.update_plan("Updated plan", "midday_checkin")
+        assert user.current_plan.content == "Updated plan"
+        assert user.current_plan.metadata["update_source"] == "midday_checkin"
     
     def test_archive_current_plan(self, sample_user_profile):
         """Test archiving current plan"""
-        with patch('models.user.User._save_current_plan'):  # Mock file operations
-            user = User(profile=sample_user_profile)
-            
-            # Create and archive a plan
-            user.update_plan("Plan to archive", "morning_planning")
-            current_plan = user.current_plan
-            user.archive_current_plan()
-            
-            assert user.current_plan is None
-            assert len(user.plan_history) == 1
-            assert user.plan_history[0] == current_plan
+        user = User(profile=sample_user_profile, persist=False)
+        
+        # Create and archive a plan
+        user.update_plan("Plan to archive", "morning_planning")
+        current_plan = user.current_plan
+        user.archive_current_plan()
+        
+        assert user.current_plan is None
+        assert len(user.plan_history) == 1
+        assert user.plan_history[0] == current_plan
 
 
 class TestAgentState:
@@ -162,18 +159,17 @@ class TestModelIntegration:
     
     def test_user_with_agent_state_integration(self, sample_user_profile, temp_data_dir):
         """Test that user and agent state work together"""
-        with patch('models.user.User._save_current_plan'):  # Mock file saving
-            user = User(profile=sample_user_profile)
-            state = create_initial_state(user.profile.user_id)
-            
-            # Update user plan
-            user.update_plan("Integrated plan", "morning_planning")
-            
-            # Update state with plan
-            state["daily_plan"] = create_daily_plan(
-                user.current_plan.content, 
-                "morning_planning"
-            )
-            
-            assert state["daily_plan"]["content"] == "Integrated plan"
-            assert state["user_context"]["user_id"] == user.profile.user_id
\ No newline at end of file
+        user = User(profile=sample_user_profile, persist=False)
+        state = create_initial_state(user.profile.user_id)
+        
+        # Update user plan
+        user.update_plan("Integrated plan", "morning_planning")
+        
+        # Update state with plan
+        state["daily_plan"] = create_daily_plan(
+            user.current_plan.content, 
+            "morning_planning"
+        )
+        
+        assert state["daily_plan"]["content"] == "Integrated plan"
+        assert state["user_context"]["user_id"] == user.profile.user_id
\ No newline at end of file
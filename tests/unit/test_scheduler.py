@@ -4,6 +4,7 @@ Unit tests for scheduler module
 import pytest
 import asyncio
 import json
+from collections import deque
 from datetime import datetime, time, timedelta
 from freezegun import freeze_time
 from unittest.mock import Mock, patch, AsyncMock
@@ -28,11 +29,37 @@ class TestSchedulerState:
             assert state.get("last_phase_transition") is None
             assert isinstance(state.get("last_check_in_times"), dict)
             assert isinstance(state.get("missed_check_ins"), list)
-            assert isinstance(state.get("nudge_history"), list)
+            assert isinstance(state.get("nudge_history"), deque)
+    
+    def test_state_fields_are_attributes(self):
+        """Test that get/set map onto the typed state fields"""
+        with patch('utils.scheduler.Path.mkdir'), \
+             patch('utils.scheduler.Path.exists', return_value=False), \
+             patch.object(SchedulerState, '_save_state'):
+            
+            state = SchedulerState("test_user")
+            state.set("daily_cycle_count", 3)
+            
+            assert state.daily_cycle_count == 3
+            assert state.to_dict()["daily_cycle_count"] == 3
+            assert "user_id" not in state.to_dict()
+            
+            with pytest.raises(KeyError):
+                state.set("unknown_field", 1)
+    
+    @patch('utils.scheduler._ENSURED_DIRS', set())
+    @patch('utils.scheduler.Path.mkdir')
+    def test_state_directory_created_once(self, mock_mkdir):
+        """Test that repeat states for a user don't re-create the directory"""
+        with patch('utils.scheduler.Path.exists', return_value=False):
+            SchedulerState("test_user")
+            SchedulerState("test_user")
+        
+        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
     
     @patch('utils.scheduler.Path.exists')
-    @patch('builtins.open')
-    def test_load_existing_state(self, mock_open, mock_exists):
+    @patch('utils.scheduler.Path.read_bytes')
+    def test_load_existing_state(self, mock_read_bytes, mock_exists):
         """Test loading existing scheduler state"""
         # Mock existing state file
         mock_exists.return_value = True
@@ -46,14 +73,9 @@ class TestSchedulerState:
         }
         
         # Mock file reading
-        mock_file = Mock()
-        mock_file.__enter__ = Mock(return_value=mock_file)
-        mock_file.__exit__ = Mock(return_value=None)
-        mock_file.read.return_value = json.dumps(existing_state)
-        mock_open.return_value = mock_file
+        mock_read_bytes.return_value = json.dumps(existing_state).encode()
         
-        with patch('json.load', return_value=existing_state), \
-             patch('utils.scheduler.Path.mkdir'):
+        with patch('utils.scheduler.Path.mkdir'):
             
             state = SchedulerState("test_user")
             
@@ -62,42 +84,166 @@ class TestSchedulerState:
             assert state.get("last_phase_transition") == "2024-01-15T10:30:00"
     
     @patch('utils.scheduler.Path.mkdir')
-    @patch('builtins.open')
-    @patch('json.dump')
-    def test_save_state(self, mock_json_dump, mock_open, mock_mkdir):
+    def test_save_state(self, mock_mkdir, tmp_path):
         """Test saving scheduler state"""
-        mock_file = Mock()
-        mock_file.__enter__ = Mock(return_value=mock_file)
-        mock_file.__exit__ = Mock(return_value=None)
-        mock_open.return_value = mock_file
-        
         with patch('utils.scheduler.Path.exists', return_value=False):
             state = SchedulerState("test_user")
-            state.set("current_phase", "evening_checkin")
+        state.state_file = tmp_path / "scheduler_state.json"
+        state.set("current_phase", "evening_checkin")
         
-        # Verify json.dump was called
-        mock_json_dump.assert_called()
-        call_args = mock_json_dump.call_args
-        saved_data = call_args[0][0]
+        # Verify the serialized state was written and no temp file is left
+        saved_data = json.loads(state.state_file.read_bytes())
         assert saved_data["current_phase"] == "evening_checkin"
+        assert list(tmp_path.iterdir()) == [state.state_file]
+    
+    @patch('utils.scheduler.Path.mkdir')
+    def test_exit_hook_does_not_keep_states_alive(self, mock_mkdir):
+        """Test that live states are flushed at exit but can still be collected"""
+        import gc
+        from utils.scheduler import _LIVE_STATES, _flush_live_states
+        
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch.object(SchedulerState, '_save_state') as mock_save:
+            state = SchedulerState("test_user")
+            discarded = SchedulerState("test_user")
+            discarded_id = id(discarded)
+            del discarded
+            gc.collect()
+            
+            assert discarded_id not in _LIVE_STATES
+            
+            state.set("current_phase", "morning_checkin")
+            state.set("daily_cycle_count", 1)
+            _flush_live_states()
+            
+            assert mock_save.call_count == 2
+            assert json.loads(mock_save.call_args[0][0])["daily_cycle_count"] == 1
+    
+    @patch('utils.scheduler.Path.mkdir')
+    def test_older_snapshot_is_not_written_last(self, mock_mkdir, tmp_path):
+        """Test that a write overtaken by a newer snapshot is dropped"""
+        with patch('utils.scheduler.Path.exists', return_value=False):
+            state = SchedulerState("test_user")
+        state.state_file = tmp_path / "scheduler_state.json"
+        
+        state.set("current_phase", "morning_checkin")
+        state.current_phase = "midday_checkin"
+        state._dirty = True
+        older = state._take_pending()
+        state.current_phase = "evening_checkin"
+        state._dirty = True
+        newer = state._take_pending()
+        
+        # A worker thread's older write finishing after the sync flush
+        state._save_state(*newer)
+        state._save_state(*older)
+        
+        assert json.loads(state.state_file.read_bytes())["current_phase"] == "evening_checkin"
+    
+    @patch('utils.scheduler.Path.mkdir')
+    def test_history_is_bounded(self, mock_mkdir, tmp_path):
+        """Test that old nudges and missed check-ins are dropped"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch('utils.scheduler.get_local_time_naive', return_value=datetime(2024, 3, 1, 12, 0)):
+            state = SchedulerState("test_user")
+            state.state_file = tmp_path / "scheduler_state.json"
+            state.set("nudge_history", [{"phase": "morning_checkin", "n": i} for i in range(60)])
+            state.nudge_history.append({"phase": "midday_checkin", "n": 60})
+            state.set("missed_check_ins", [
+                {"phase": "morning_checkin", "missed_date": "2024-01-15"},
+                {"phase": "midday_checkin", "missed_date": "2024-02-20"}
+            ])
+            state.flush()
+        
+        saved_data = json.loads(state.state_file.read_bytes())
+        assert len(saved_data["nudge_history"]) == 50
+        assert saved_data["nudge_history"][-1]["n"] == 60
+        assert saved_data["missed_check_ins"] == [{"phase": "midday_checkin", "missed_date": "2024-02-20"}]
+    
+    @patch('utils.scheduler.Path.mkdir')
+    def test_writes_are_coalesced(self, mock_mkdir):
+        """Test that rapid updates are written once and flushed on demand"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch.object(SchedulerState, '_save_state') as mock_save:
+            state = SchedulerState("test_user")
+            state.set("current_phase", "morning_checkin")
+            state.set("daily_cycle_count", 1)
+            state.update({"current_phase": "midday_checkin"})
+            
+            assert mock_save.call_count == 1
+            
+            state.flush()
+            assert mock_save.call_count == 2
+            
+            # Nothing pending, so no extra write
+            state.flush()
+            assert mock_save.call_count == 2
 
+    
+    @pytest.mark.asyncio
+    @patch('utils.scheduler.Path.mkdir')
+    async def test_pending_writes_flush_after_interval(self, mock_mkdir):
+        """Test that a running loop writes pending changes without an explicit flush"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch.object(SchedulerState, 'FLUSH_INTERVAL', 0.01), \
+             patch.object(SchedulerState, '_save_state') as mock_save:
+            state = SchedulerState("test_user")
+            state.set("current_phase", "morning_checkin")
+            state.set("daily_cycle_count", 1)
+            state.set("daily_cycle_count", 2)
+            
+            assert mock_save.call_count == 1
+            
+            await asyncio.sleep(0.05)
+            assert mock_save.call_count == 2
+            assert state.daily_cycle_count == 2
+    
+    @patch('utils.scheduler.Path.mkdir')
+    def test_deferred_flush_rescheduled_on_new_loop(self, mock_mkdir):
+        """Test that a timer from a closed loop doesn't block scheduling on the next one"""
+        async def change(state, value):
+            state.set("daily_cycle_count", value)
+            return state._flush_handle
+        
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch.object(SchedulerState, '_save_state'):
+            state = SchedulerState("test_user")
+            state.set("current_phase", "morning_checkin")
+            
+            first_handle = asyncio.run(change(state, 1))
+            second_handle = asyncio.run(change(state, 2))
+            state.flush()
+        
+        assert first_handle is not None
+        assert second_handle is not None and second_handle is not first_handle
+    
+    @pytest.mark.asyncio
+    @patch('utils.scheduler.Path.mkdir')
+    async def test_aset_writes_off_loop(self, mock_mkdir):
+        """Test that async updates hand the file write to a worker thread"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch('utils.scheduler.asyncio.to_thread', new_callable=AsyncMock) as mock_to_thread:
+            state = SchedulerState("test_user")
+            await state.aset("current_phase", "evening_checkin")
+            
+            mock_to_thread.assert_awaited_once()
+            write, payload, _ = mock_to_thread.call_args[0]
+            assert write == state._save_state
+            assert json.loads(payload)["current_phase"] == "evening_checkin"
 
 class TestDailyScheduler:
     """Test DailyScheduler class"""
     
-    def test_scheduler_initialization(self):
+    def test_scheduler_initialization(self, no_io_scheduler):
         """Test scheduler initialization"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
-            
-            scheduler = DailyScheduler("test_user")
-            
-            assert scheduler.user_id == "test_user"
-            assert scheduler.schedule == DailyScheduler.DEFAULT_SCHEDULE
-            assert not scheduler.is_running
-            assert scheduler.workflow_nodes == {}
+        scheduler = DailyScheduler("test_user")
+        
+        assert scheduler.user_id == "test_user"
+        assert scheduler.schedule == DailyScheduler.DEFAULT_SCHEDULE
+        assert not scheduler.is_running
+        assert scheduler.workflow_nodes == {}
     
-    def test_custom_schedule_loading(self):
+    def test_custom_schedule_loading(self, no_io_scheduler):
         """Test loading custom user schedule"""
         custom_schedule = {
             "morning_planning": "06:30",
@@ -107,101 +253,174 @@ class TestDailyScheduler:
             "nighttime_planning": "20:30"
         }
         
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'), \
-             patch('utils.scheduler.Path.exists', return_value=True), \
-             patch('builtins.open'), \
-             patch('json.load', return_value=custom_schedule):
+        with patch('utils.scheduler.Path.exists', return_value=True), \
+             patch('utils.scheduler.Path.read_bytes', return_value=json.dumps(custom_schedule).encode()):
             
             scheduler = DailyScheduler("test_user")
             
             assert scheduler.schedule["morning_planning"] == time(6, 30)
             assert scheduler.schedule["evening_checkin"] == time(17, 30)
     
-    def test_get_next_phase(self):
+    def test_get_next_phase(self, no_io_scheduler):
         """Test phase progression logic"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
-            
-            scheduler = DailyScheduler("test_user")
-            
-            assert scheduler.get_next_phase("morning_planning") == "morning_checkin"
-            assert scheduler.get_next_phase("midday_checkin") == "evening_checkin"
-            assert scheduler.get_next_phase("nighttime_planning") == "morning_planning"
-            assert scheduler.get_next_phase("invalid_phase") == "morning_planning"
+        scheduler = DailyScheduler("test_user")
+        
+        assert scheduler.get_next_phase("morning_planning") == "morning_checkin"
+        assert scheduler.get_next_phase("midday_checkin") == "evening_checkin"
+        assert scheduler.get_next_phase("nighttime_planning") == "morning_planning"
+        assert scheduler.get_next_phase("invalid_phase") == "morning_planning"
     
     @freeze_time("2024-01-15 14:30:00")
-    def test_get_current_expected_phase(self):
+    def test_get_current_expected_phase(self, no_io_scheduler):
         """Test determining current expected phase based on time"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
+        scheduler = DailyScheduler("test_user")
+        
+        # At 14:30, should be in midday_checkin (13:00) but not evening (18:00)
+        expected_phase = scheduler.get_current_expected_phase()
+        assert expected_phase == "midday_checkin"
+    
+    def test_get_current_expected_phase_before_first_phase(self, no_io_scheduler):
+        """Test that early morning hours map to the last phase of the previous day"""
+        with patch('utils.scheduler.get_local_time_naive', return_value=datetime(2024, 1, 15, 5, 0)):
             
             scheduler = DailyScheduler("test_user")
             
-            # At 14:30, should be in midday_checkin (13:00) but not evening (18:00)
-            expected_phase = scheduler.get_current_expected_phase()
-            assert expected_phase == "midday_checkin"
+            assert scheduler.get_current_expected_phase() == "nighttime_planning"
     
     @freeze_time("2024-01-15 10:00:00")
-    def test_is_check_in_overdue(self):
+    def test_is_check_in_overdue(self, no_io_scheduler):
         """Test overdue check-in detection"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
+        scheduler = DailyScheduler("test_user")
+        
+        # Morning planning at 7:00 + 2 hour grace = 9:00 overdue time
+        # At 10:00, should be overdue
+        assert scheduler.is_check_in_overdue("morning_planning") is True
+        
+        # Morning checkin at 9:00 + 3 hour grace = 12:00 overdue time
+        # At 10:00, should not be overdue
+        assert scheduler.is_check_in_overdue("morning_checkin") is False
+    
+    @freeze_time("2024-01-15 10:00:00")
+    def test_is_check_in_overdue_cached_within_minute(self, no_io_scheduler):
+        """Test that overdue checks are reused within the same minute"""
+        with patch('utils.scheduler.get_local_time_naive', return_value=datetime(2024, 1, 15, 10, 0)) as mock_now:
             
             scheduler = DailyScheduler("test_user")
             
-            # Morning planning at 7:00 + 2 hour grace = 9:00 overdue time
-            # At 10:00, should be overdue
-            assert scheduler.is_check_in_overdue("morning_planning") is True
+            first = scheduler.is_check_in_overdue("morning_planning")
+            second = scheduler.is_check_in_overdue("morning_planning")
             
-            # Morning checkin at 9:00 + 3 hour grace = 12:00 overdue time
-            # At 10:00, should not be overdue
-            assert scheduler.is_check_in_overdue("morning_checkin") is False
+            assert first is second is True
+            assert mock_now.call_count == 1
     
     @freeze_time("2024-01-15 08:30:00")
-    def test_get_time_until_next_phase(self):
+    def test_get_time_until_next_phase(self, no_io_scheduler):
         """Test calculating time until next phase"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
+        scheduler = DailyScheduler("test_user")
+        
+        next_info = scheduler.get_time_until_next_phase()
+        
+        assert next_info is not None
+        assert next_info["phase"] == "morning_checkin"  # Next at 9:00
+        assert next_info["minutes_until"] == 30  # 30 minutes from 8:30 to 9:00
+    
+    def test_get_time_until_next_phase_rolls_over(self, no_io_scheduler):
+        """Test that after the last phase the next one is tomorrow's first phase"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch('utils.scheduler.get_local_time_naive', return_value=datetime(2024, 1, 15, 22, 0)):
             
             scheduler = DailyScheduler("test_user")
             
             next_info = scheduler.get_time_until_next_phase()
             
-            assert next_info is not None
-            assert next_info["phase"] == "morning_checkin"  # Next at 9:00
-            assert next_info["minutes_until"] == 30  # 30 minutes from 8:30 to 9:00
+            assert next_info["phase"] == "morning_planning"
+            assert next_info["datetime"] == datetime(2024, 1, 16, 7, 0)
+            assert next_info["minutes_until"] == 540
+    
+    def test_next_phase_at_boundaries(self, no_io_scheduler):
+        """Test that a phase starting exactly now counts as passed, not upcoming"""
+        with patch('utils.scheduler.Path.exists', return_value=False):
+            scheduler = DailyScheduler("test_user")
+        
+        assert scheduler._next_phase_at(datetime(2024, 1, 15, 9, 0)) == ("midday_checkin", datetime(2024, 1, 15, 13, 0))
+        assert scheduler._next_phase_at(datetime(2024, 1, 15, 8, 59, 59)) == ("morning_checkin", datetime(2024, 1, 15, 9, 0))
+        assert scheduler._next_phase_at(datetime(2024, 1, 15, 21, 0)) == ("morning_planning", datetime(2024, 1, 16, 7, 0))
+    
+    def test_evaluate_schedule_in_one_pass(self, no_io_scheduler):
+        """Test that expected phase, overdue state and next phase agree with the individual checks"""
+        with patch('utils.scheduler.Path.exists', return_value=False):
+            scheduler = DailyScheduler("test_user")
+        
+        now = datetime(2024, 1, 15, 19, 0)
+        assert scheduler._evaluate(now, "morning_planning") == (
+            "evening_checkin", True, "nighttime_planning", datetime(2024, 1, 15, 21, 0)
+        )
+        assert scheduler._evaluate(now, "evening_checkin")[1] is False
+        assert scheduler._evaluate(now, "unknown_phase")[1] is False
+    
+    def test_next_wake_at(self, no_io_scheduler):
+        """Test that the loop wakes for reminders and phase starts, not on a fixed poll"""
+        with patch('utils.scheduler.Path.exists', return_value=False):
+            scheduler = DailyScheduler("test_user")
+        scheduler.state.set("current_phase", "morning_planning")
+        
+        # 8:00 is before the 8:30 reminder for the 9:00 check-in
+        assert scheduler._next_wake_at(datetime(2024, 1, 15, 8, 0)) == datetime(2024, 1, 15, 8, 30)
+        # Inside the reminder window, the next wake is the phase itself
+        assert scheduler._next_wake_at(datetime(2024, 1, 15, 8, 45)) == datetime(2024, 1, 15, 9, 0)
+        # After the last phase, roll over to tomorrow's reminder
+        scheduler.state.set("current_phase", "nighttime_planning")
+        assert scheduler._next_wake_at(datetime(2024, 1, 15, 23, 30)) == datetime(2024, 1, 16, 6, 30)
     
     @pytest.mark.asyncio
-    async def test_send_gentle_nudge(self):
-        """Test sending gentle nudges"""
-        mock_telegram = AsyncMock()
-        mock_state = Mock()
-        mock_state.get.return_value = []
-        mock_state.set = Mock()
+    async def test_failed_transition_is_retried_soon(self, no_io_scheduler):
+        """Test that an overdue transition that fails is retried within the retry delay"""
+        now = datetime(2024, 1, 15, 9, 30)
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch('utils.scheduler.User.load_or_create'), \
+             patch('utils.scheduler.create_initial_state', return_value={}), \
+             patch('utils.scheduler.get_local_time_naive', return_value=now):
+            scheduler = DailyScheduler("test_user")
+            scheduler.state.set("current_phase", "morning_planning")
+            scheduler.set_workflow_nodes({
+                "morning_checkin": AsyncMock(side_effect=RuntimeError("workflow down"))
+            })
+            
+            wake_at = await scheduler.check_and_handle_transitions()
         
-        with patch('utils.scheduler.SchedulerState', return_value=mock_state):
-            scheduler = DailyScheduler("test_user", mock_telegram)
+        assert scheduler.state.get("current_phase") == "morning_planning"
+        assert now < wake_at <= now + timedelta(seconds=DailyScheduler.TRANSITION_RETRY_SECONDS)
+    
+    @pytest.mark.asyncio
+    async def test_update_schedule_interrupts_sleep(self, no_io_scheduler):
+        """Test that a schedule edit wakes a sleeping scheduler immediately"""
+        with patch.object(DailyScheduler, '_save_user_schedule'):
+            scheduler = DailyScheduler("test_user")
             
-            await scheduler.send_gentle_nudge("morning_checkin", "Time for check-in!")
+            sleeper = asyncio.create_task(scheduler._sleep_until(datetime.now() + timedelta(hours=1)))
+            await asyncio.sleep(0)
+            scheduler.update_schedule("morning_planning", time(8, 0))
             
-            mock_telegram.send_message.assert_called_once_with("Time for check-in!")
-            mock_state.set.assert_called()
+            await asyncio.wait_for(sleeper, timeout=1)
     
     @pytest.mark.asyncio
-    async def test_trigger_phase_transition(self):
+    async def test_send_gentle_nudge(self, no_io_scheduler):
+        """Test sending gentle nudges"""
+        mock_telegram = AsyncMock()
+        scheduler = DailyScheduler("test_user", mock_telegram)
+        
+        await scheduler.send_gentle_nudge("morning_checkin", "Time for check-in!")
+        
+        mock_telegram.send_message.assert_called_once_with("Time for check-in!")
+        assert len(scheduler.state.get("nudge_history")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_trigger_phase_transition(self, no_io_scheduler):
         """Test triggering phase transitions"""
         mock_workflow_func = AsyncMock()
         mock_workflow_func.return_value = {"current_phase": "morning_checkin", "messages": []}
         
-        mock_state = Mock()
-        mock_state.get.return_value = {}
-        mock_state.update = Mock()
-        mock_state.set = Mock()
-        
-        with patch('utils.scheduler.SchedulerState', return_value=mock_state), \
-             patch('utils.scheduler.TelegramBotInterface'), \
-             patch('utils.scheduler.User.load_or_create'), \
+        with patch('utils.scheduler.User.load_or_create'), \
              patch('utils.scheduler.create_initial_state'):
             
             scheduler = DailyScheduler("test_user")
@@ -211,27 +430,81 @@ class TestDailyScheduler:
             
             assert result is True
             mock_workflow_func.assert_called_once()
-            mock_state.update.assert_called()
+            assert scheduler.state.get("current_phase") == "morning_checkin"
+            assert "morning_checkin" in scheduler.state.get("last_check_in_times")
     
     @pytest.mark.asyncio
-    async def test_trigger_phase_transition_no_node(self):
+    async def test_trigger_phase_transition_no_node(self, no_io_scheduler):
         """Test triggering transition with missing workflow node"""
-        mock_state = Mock()
+        scheduler = DailyScheduler("test_user")
+        
+        result = await scheduler.trigger_phase_transition("invalid_phase")
         
-        with patch('utils.scheduler.SchedulerState', return_value=mock_state), \
-             patch('utils.scheduler.TelegramBotInterface'):
+        assert result is False
+    
+    @pytest.mark.asyncio
+    async def test_skipped_phases_recorded_as_missed(self, no_io_scheduler):
+        """Test that jumping several phases ahead records the skipped ones"""
+        with patch('utils.scheduler.Path.exists', return_value=False), \
+             patch('utils.scheduler.get_local_time_naive', return_value=datetime(2024, 1, 15, 19, 0)):
             
             scheduler = DailyScheduler("test_user")
+            scheduler.state.set("current_phase", "morning_planning")
             
-            result = await scheduler.trigger_phase_transition("invalid_phase")
+            await scheduler.check_and_handle_transitions()
             
-            assert result is False
+            assert scheduler.state.get("missed_check_ins") == [
+                {"phase": "morning_checkin", "missed_date": "2024-01-15"},
+                {"phase": "midday_checkin", "missed_date": "2024-01-15"}
+            ]
     
-    def test_update_schedule(self):
+    @pytest.mark.asyncio
+    async def test_upcoming_phase_nudged_once(self, no_io_scheduler):
+        """Test that repeated checks inside the reminder window send one nudge"""
+        now = datetime(2024, 1, 15, 8, 40)
+        with patch('utils.scheduler.get_local_time_naive', return_value=now):
+            scheduler = DailyScheduler("test_user")
+            scheduler.state.set("current_phase", "midday_checkin")
+            
+            with patch.object(scheduler, '_evaluate', return_value=(
+                "morning_planning", False, "morning_checkin", datetime(2024, 1, 15, 9, 0)
+            )):
+                await scheduler.check_and_handle_transitions()
+                await scheduler.check_and_handle_transitions()
+            
+            scheduler.telegram_bot.send_message.assert_awaited_once()
+            assert scheduler.state.get("last_nudge_for") == {"morning_checkin": "2024-01-15T09:00:00"}
+    
+    @pytest.mark.asyncio
+    async def test_undelivered_nudge_is_sent_again(self, no_io_scheduler):
+        """Test that a nudge is only recorded once Telegram accepts it"""
+        now = datetime(2024, 1, 15, 8, 40)
+        with patch('utils.scheduler.get_local_time_naive', return_value=now):
+            scheduler = DailyScheduler("test_user")
+            scheduler.state.set("current_phase", "midday_checkin")
+            scheduler.telegram_bot.send_message.side_effect = [False, True]
+            
+            with patch.object(scheduler, '_evaluate', return_value=(
+                "morning_planning", False, "morning_checkin", datetime(2024, 1, 15, 9, 0)
+            )), patch.object(DailyScheduler, 'NUDGE_RETRY_SECONDS', 0):
+                await scheduler.check_and_handle_transitions()
+                await asyncio.gather(*scheduler._pending_sends)
+                
+                assert not scheduler.state.get("last_nudge_for")
+                assert not scheduler.state.get("nudge_history")
+                
+                # The failed send wakes the scheduler to check again
+                await asyncio.wait_for(scheduler._wake.wait(), timeout=1)
+                await scheduler.check_and_handle_transitions()
+                await asyncio.gather(*scheduler._pending_sends)
+            
+            assert scheduler.telegram_bot.send_message.await_count == 2
+            assert scheduler.state.get("last_nudge_for") == {"morning_checkin": "2024-01-15T09:00:00"}
+            assert len(scheduler.state.get("nudge_history")) == 1
+    
+    def test_update_schedule(self, no_io_scheduler):
         """Test updating schedule times"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'), \
-             patch.object(DailyScheduler, '_save_user_schedule'):
+        with patch.object(DailyScheduler, '_save_user_schedule'):
             
             scheduler = DailyScheduler("test_user")
             
@@ -240,36 +513,28 @@ class TestDailyScheduler:
             
             assert scheduler.schedule["morning_planning"] == new_time
     
-    def test_update_schedule_invalid_phase(self):
+    def test_update_schedule_invalid_phase(self, no_io_scheduler):
         """Test updating schedule with invalid phase"""
-        with patch('utils.scheduler.SchedulerState'), \
-             patch('utils.scheduler.TelegramBotInterface'):
-            
-            scheduler = DailyScheduler("test_user")
-            
-            with pytest.raises(ValueError, match="Invalid phase"):
-                scheduler.update_schedule("invalid_phase", time(8, 0))
+        scheduler = DailyScheduler("test_user")
+        
+        with pytest.raises(ValueError, match="Invalid phase"):
+            scheduler.update_schedule("invalid_phase", time(8, 0))
     
-    def test_get_schedule_status(self):
+    def test_get_schedule_status(self, no_io_scheduler):
         """Test getting schedule status"""
-        mock_state = Mock()
-        mock_state.get.side_effect = lambda key, default=None: {
+        scheduler = DailyScheduler("test_user")
+        scheduler.state.update({
             "current_phase": "morning_checkin",
             "last_phase_transition": "2024-01-15T09:00:00",
             "missed_check_ins": []
-        }.get(key, default)
+        })
         
-        with patch('utils.scheduler.SchedulerState', return_value=mock_state), \
-             patch('utils.scheduler.TelegramBotInterface'):
-            
-            scheduler = DailyScheduler("test_user")
-            
-            status = scheduler.get_schedule_status()
-            
-            assert status["current_phase"] == "morning_checkin"
-            assert "current_time" in status
-            assert "schedule" in status
-            assert "is_on_schedule" in status
+        status = scheduler.get_schedule_status()
+        
+        assert status["current_phase"] == "morning_checkin"
+        assert "current_time" in status
+        assert "schedule" in status
+        assert "is_on_schedule" in status
 
 
 class TestSchedulerManager:
@@ -312,11 +577,12 @@ class TestSchedulerManager:
     
     @pytest.mark.asyncio
     async def test_start_all_schedulers(self):
-        """Test starting all schedulers"""
+        """Test that one manager loop checks every scheduler until they are due again"""
+        tomorrow = datetime.now() + timedelta(days=1)
         mock_scheduler1 = Mock()
-        mock_scheduler1.start_scheduler = AsyncMock()
+        mock_scheduler1.check_and_handle_transitions = AsyncMock(return_value=tomorrow)
         mock_scheduler2 = Mock()
-        mock_scheduler2.start_scheduler = AsyncMock()
+        mock_scheduler2.check_and_handle_transitions = AsyncMock(return_value=tomorrow)
         
         manager = SchedulerManager()
         manager.schedulers = {
@@ -324,20 +590,38 @@ class TestSchedulerManager:
             "user2": mock_scheduler2
         }
         
-        # Mock asyncio.gather to avoid actually waiting
-        with patch('asyncio.gather') as mock_gather:
-            mock_gather.return_value = asyncio.Future()
-            mock_gather.return_value.set_result(None)
-            
-            with patch('asyncio.create_task') as mock_create_task:
-                mock_task1 = Mock()
-                mock_task2 = Mock()
-                mock_create_task.side_effect = [mock_task1, mock_task2]
-                
-                await manager.start_all_schedulers()
-                
-                assert mock_create_task.call_count == 2
-                mock_gather.assert_called_once_with(mock_task1, mock_task2)
+        task = asyncio.create_task(manager.start_all_schedulers())
+        await asyncio.sleep(0.01)
+        
+        # Both were checked once; neither is due again until tomorrow
+        mock_scheduler1.check_and_handle_transitions.assert_awaited_once()
+        mock_scheduler2.check_and_handle_transitions.assert_awaited_once()
+        mock_scheduler1.start_scheduler.assert_not_called()
+        
+        manager.stop_all_schedulers()
+        await asyncio.wait_for(task, timeout=1)
+    
+    @pytest.mark.asyncio
+    async def test_wake_rechecks_schedulers(self):
+        """Test that a wake-up (new scheduler or schedule edit) re-checks immediately"""
+        tomorrow = datetime.now() + timedelta(days=1)
+        mock_scheduler = Mock()
+        mock_scheduler.check_and_handle_transitions = AsyncMock(return_value=tomorrow)
+        
+        manager = SchedulerManager()
+        manager.schedulers = {"user1": mock_scheduler}
+        
+        task = asyncio.create_task(manager.run())
+        await asyncio.sleep(0.01)
+        
+        # Managed schedulers share the manager's wake event
+        mock_scheduler._wake.set()
+        await asyncio.sleep(0.01)
+        
+        assert mock_scheduler.check_and_handle_transitions.await_count == 2
+        
+        manager.stop_all_schedulers()
+        await asyncio.wait_for(task, timeout=1)
     
     def test_stop_all_schedulers(self):
         """Test stopping all schedulers"""
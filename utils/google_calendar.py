@@ -1,13 +1,15 @@
 import os
+import sys
+import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import time
+import threading
+import importlib
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +18,92 @@ SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 CREDENTIALS_FILE = 'data/users/alex/google_credentials.json'
 TOKEN_FILE = 'data/users/alex/google_token.json'
 
+# Google client libraries are heavy to import, so they're loaded on first use
+_GOOGLE_IMPORTS = {
+    'Request': ('google.auth.transport.requests', 'Request'),
+    'Credentials': ('google.oauth2.credentials', 'Credentials'),
+    'InstalledAppFlow': ('google_auth_oauthlib.flow', 'InstalledAppFlow'),
+    'build': ('googleapiclient.discovery', 'build'),
+    'HttpError': ('googleapiclient.errors', 'HttpError'),
+}
+_lazy: Dict[str, Any] = {}
+
+
+def _google(name: str) -> Any:
+    """Import a Google client symbol on first use (raises ImportError if not installed)"""
+    try:
+        return _lazy[name]
+    except KeyError:
+        module_name, attr = _GOOGLE_IMPORTS[name]
+        symbol = _lazy[name] = getattr(importlib.import_module(module_name), attr)
+        return symbol
+
+
+# Built API services keyed by user_id -> (token mtime, credentials, service)
+_SERVICE_CACHE: Dict[str, Tuple[float, Any, Any]] = {}
+
+# One lock per user, shared by every manager using that user's service:
+# httplib2.Http is not thread-safe, so the to_thread fetches must not overlap
+_FETCH_LOCKS: Dict[str, threading.RLock] = {}
+
+if sys.version_info >= (3, 11):
+    # fromisoformat parses the trailing 'Z' natively from 3.11 onwards
+    _PARSE_ISO = datetime.fromisoformat
+else:
+    def _PARSE_ISO(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _rfc3339(value: datetime) -> str:
+    """Format a datetime for the Calendar API; naive values are treated as local time"""
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.isoformat(timespec='seconds')
+
+
+def _day_bounds(now: datetime) -> Tuple[datetime, datetime]:
+    """Get the first and last instant of the day containing now"""
+    return (
+        now.replace(hour=0, minute=0, second=0, microsecond=0),
+        now.replace(hour=23, minute=59, second=59, microsecond=999999)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_cached(value: str) -> datetime:
+    """Parse an all-day event date, memoized since many events share dates"""
+    return datetime.fromisoformat(value)
+
+
+@dataclass(slots=True)
+class CalendarEvent:
+    """A simplified calendar event"""
+    id: Optional[str]
+    summary: str
+    description: str
+    start_time: datetime
+    end_time: datetime
+    is_all_day: bool
+    location: str
+    status: str
+    url: str
+    duration_minutes: Optional[int]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
 
 class GoogleCalendarManager:
+    # Seconds that fetched events are reused before hitting the API again
+    _CACHE_TTL = 60.0
+    
     def __init__(self, user_id: str = "alex"):
         self.user_id = user_id
         self.service = None
         self.credentials = None
+        self._events_resource = None
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = _FETCH_LOCKS.setdefault(user_id, threading.RLock())
         self._setup_credentials()
     
     def _setup_credentials(self):
@@ -47,6 +129,21 @@ class GoogleCalendarManager:
             except Exception as e:
                 logger.error(f"Error creating credentials from environment: {e}")
         
+        # Reuse the service built for this user if the token file hasn't changed
+        token_mtime = self._token_mtime(token_path)
+        cached = _SERVICE_CACHE.get(self.user_id)
+        if cached and token_mtime is not None and cached[0] == token_mtime and cached[1].valid:
+            _, self.credentials, self.service = cached
+            self._events_resource = self.service.events()
+            logger.info("Reusing cached Google Calendar API service")
+            return
+        
+        try:
+            Credentials = _google('Credentials')
+        except ImportError as e:
+            logger.warning(f"Google client libraries not installed: {e}")
+            return
+        
         # Load existing token
         if os.path.exists(token_path):
             try:
@@ -60,7 +157,7 @@ class GoogleCalendarManager:
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 try:
-                    creds.refresh(Request())
+                    creds.refresh(_google('Request')())
                 except Exception as e:
                     logger.error(f"Error refreshing credentials: {e}")
                     creds = None
@@ -68,7 +165,7 @@ class GoogleCalendarManager:
             if not creds:
                 if os.path.exists(credentials_path):
                     try:
-                        flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
+                        flow = _google('InstalledAppFlow').from_client_secrets_file(credentials_path, SCOPES)
                         creds = flow.run_local_server(port=0)
                         logger.info("Successfully completed OAuth flow")
                     except Exception as e:
@@ -90,92 +187,126 @@ class GoogleCalendarManager:
         
         if creds:
             try:
-                self.service = build('calendar', 'v3', credentials=creds)
+                self.service = _google('build')(
+                    'calendar', 'v3', credentials=creds,
+                    cache_discovery=False, static_discovery=True
+                )
+                # Resource wrappers are synthesized on every events() call, so build it once
+                self._events_resource = self.service.events()
                 logger.info("Google Calendar API service initialized")
+                
+                token_mtime = self._token_mtime(token_path)
+                if token_mtime is not None:
+                    _SERVICE_CACHE[self.user_id] = (token_mtime, creds, self.service)
             except Exception as e:
                 logger.error(f"Error building calendar service: {e}")
         else:
             logger.warning("No valid Google Calendar credentials available")
     
+    @staticmethod
+    def _token_mtime(token_path: str) -> Optional[float]:
+        """Get the token file modification time, or None if it doesn't exist"""
+        try:
+            return os.path.getmtime(token_path)
+        except OSError:
+            return None
+    
     def is_available(self) -> bool:
         """Check if Google Calendar is available"""
         return self.service is not None
     
-    def get_todays_events(self) -> List[Dict[str, Any]]:
+    def _cached(self, key: Tuple, ttl: float, fn: Callable[[], Any]) -> Any:
+        """Return the cached value for key if still fresh, otherwise call fn and cache it"""
+        # Held across the fetch so concurrent callers wait for one request
+        # instead of sending their own
+        with self._lock:
+            now = time.monotonic()
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+            
+            value = fn()
+            
+            # Drop stale entries so time-bucketed keys don't accumulate
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < ttl}
+            self._cache[key] = (now, value)
+            return value
+    
+    def _fetch_window(self, time_min: datetime, time_max: datetime) -> List[CalendarEvent]:
+        """Fetch and process all events between two times in a single API call"""
+        with self._lock:
+            events_resource = self._events_resource or self.service.events()
+            events_result = events_resource.list(
+                calendarId='primary',
+                timeMin=_rfc3339(time_min),
+                timeMax=_rfc3339(time_max),
+                singleEvents=True,
+                orderBy='startTime'
+            ).execute()
+        
+        events = events_result.get('items', [])
+        
+        # Process events to extract relevant information
+        processed_events = []
+        for event in events:
+            processed_event = self._process_event(event)
+            if processed_event:
+                processed_events.append(processed_event)
+        
+        return processed_events
+    
+    def get_todays_events(self) -> List[CalendarEvent]:
         """Get today's calendar events"""
         if not self.service:
             logger.warning("Google Calendar service not available")
             return []
         
         try:
-            # Get start and end of today
-            now = datetime.now()
-            start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-            
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=start_of_day.isoformat() + 'Z',
-                timeMax=end_of_day.isoformat() + 'Z',
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            # Process events to extract relevant information
-            processed_events = []
-            for event in events:
-                processed_event = self._process_event(event)
-                if processed_event:
-                    processed_events.append(processed_event)
+            # Day bounds are only computed when the cache misses
+            processed_events = self._cached(
+                ("today", date.today().toordinal()),
+                self._CACHE_TTL,
+                lambda: self._fetch_window(*_day_bounds(datetime.now()))
+            )
             
             logger.info(f"Retrieved {len(processed_events)} events for today")
             return processed_events
             
-        except HttpError as error:
+        except _google('HttpError') as error:
             logger.error(f"An error occurred retrieving calendar events: {error}")
             return []
     
-    def get_upcoming_events(self, hours: int = 24) -> List[Dict[str, Any]]:
+    def get_upcoming_events(self, hours: int = 24) -> List[CalendarEvent]:
         """Get upcoming events for the next specified hours"""
         if not self.service:
             logger.warning("Google Calendar service not available")
             return []
         
         try:
-            now = datetime.now()
-            end_time = now + timedelta(hours=hours)
-            
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=now.isoformat() + 'Z',
-                timeMax=end_time.isoformat() + 'Z',
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            processed_events = []
-            for event in events:
-                processed_event = self._process_event(event)
-                if processed_event:
-                    processed_events.append(processed_event)
+            processed_events = self._cached(
+                ("upcoming", hours, int(time.time() // 60)),
+                self._CACHE_TTL,
+                lambda: self._fetch_upcoming(hours)
+            )
             
             logger.info(f"Retrieved {len(processed_events)} upcoming events")
             return processed_events
             
-        except HttpError as error:
+        except _google('HttpError') as error:
             logger.error(f"An error occurred retrieving upcoming events: {error}")
             return []
     
-    def get_next_event(self) -> Optional[Dict[str, Any]]:
+    def _fetch_upcoming(self, hours: int) -> List[CalendarEvent]:
+        """Fetch events from now through the given number of hours"""
+        now = datetime.now()
+        return self._fetch_window(now, now + timedelta(hours=hours))
+    
+    def get_next_event(self) -> Optional[CalendarEvent]:
         """Get the next upcoming event"""
         upcoming = self.get_upcoming_events(hours=24)
         return upcoming[0] if upcoming else None
     
-    def _process_event(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _process_event(self, event: Dict[str, Any]) -> Optional[CalendarEvent]:
         """Process a raw calendar event into a simplified format"""
         try:
             summary = event.get('summary', 'No title')
@@ -185,9 +316,11 @@ class GoogleCalendarManager:
             end = event.get('end', {})
             
             # All-day events
-            if 'date' in start:
-                start_time = datetime.fromisoformat(start['date'])
-                end_time = datetime.fromisoformat(end['date']) if 'date' in end else start_time
+            start_date = start.get('date')
+            if start_date:
+                start_time = _parse_date_cached(start_date)
+                end_date = end.get('date')
+                end_time = _parse_date_cached(end_date) if end_date else start_time
                 is_all_day = True
             else:
                 # Timed events
@@ -195,55 +328,82 @@ class GoogleCalendarManager:
                 end_datetime = end.get('dateTime', '')
                 
                 if start_datetime:
-                    start_time = datetime.fromisoformat(start_datetime.replace('Z', '+00:00'))
-                    end_time = datetime.fromisoformat(end_datetime.replace('Z', '+00:00')) if end_datetime else start_time
+                    start_time = _PARSE_ISO(start_datetime)
+                    end_time = _PARSE_ISO(end_datetime) if end_datetime else start_time
                     is_all_day = False
                 else:
                     return None
             
-            return {
-                'id': event.get('id'),
-                'summary': summary,
-                'description': event.get('description', ''),
-                'start_time': start_time,
-                'end_time': end_time,
-                'is_all_day': is_all_day,
-                'location': event.get('location', ''),
-                'status': event.get('status', 'confirmed'),
-                'url': event.get('htmlLink', ''),
-                'duration_minutes': int((end_time - start_time).total_seconds() / 60) if not is_all_day else None
-            }
+            return CalendarEvent(
+                id=event.get('id'),
+                summary=summary,
+                description=event.get('description', ''),
+                start_time=start_time,
+                end_time=end_time,
+                is_all_day=is_all_day,
+                location=event.get('location', ''),
+                status=event.get('status', 'confirmed'),
+                url=event.get('htmlLink', ''),
+                duration_minutes=int((end_time - start_time).total_seconds() / 60) if not is_all_day else None
+            )
             
         except Exception as e:
             logger.error(f"Error processing event: {e}")
             return None
     
-    def format_events_for_display(self, events: List[Dict[str, Any]]) -> str:
+    @staticmethod
+    def _to_local_naive(value: datetime) -> datetime:
+        """Convert an event time to naive local time (all-day events are already naive)"""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone().replace(tzinfo=None)
+    
+    def format_events_for_display(self, events: List[CalendarEvent]) -> str:
         """Format events for display in chat"""
         if not events:
             return "No events found."
         
         formatted = []
         for event in events:
-            if event['is_all_day']:
+            if event.is_all_day:
                 time_str = "All day"
             else:
-                start_str = event['start_time'].strftime("%H:%M")
-                end_str = event['end_time'].strftime("%H:%M")
+                start_str = event.start_time.strftime("%H:%M")
+                end_str = event.end_time.strftime("%H:%M")
                 time_str = f"{start_str} - {end_str}"
             
-            event_str = f"• {time_str}: {event['summary']}"
-            if event['location']:
-                event_str += f" ({event['location']})"
+            event_str = f"• {time_str}: {event.summary}"
+            if event.location:
+                event_str += f" ({event.location})"
             
             formatted.append(event_str)
         
         return "\n".join(formatted)
     
-    def get_calendar_context_for_planning(self) -> Dict[str, Any]:
-        """Get calendar context for daily planning"""
-        today_events = self.get_todays_events()
-        next_event = self.get_next_event()
+    def _fetch_planning_events(self, now: datetime) -> List[CalendarEvent]:
+        """Fetch events from the start of today through the next 24 hours"""
+        if not self.service:
+            return []
+        
+        start_of_day, end_of_day = _day_bounds(now)
+        window_end = max(end_of_day, now + timedelta(hours=24))
+        
+        # One request covers both today's events and the next upcoming one
+        try:
+            return self._cached(
+                ("planning", int(time.time() // 60)),
+                self._CACHE_TTL,
+                lambda: self._fetch_window(start_of_day, window_end)
+            )
+        except _google('HttpError') as error:
+            logger.error(f"An error occurred retrieving planning events: {error}")
+            return []
+    
+    def _build_planning_context(self, events: List[CalendarEvent], now: datetime) -> Dict[str, Any]:
+        """Split fetched events into today's events and the next event"""
+        _, end_of_day = _day_bounds(now)
+        today_events = [e for e in events if self._to_local_naive(e.start_time) <= end_of_day]
+        next_event = next((e for e in events if self._to_local_naive(e.end_time) > now), None)
         
         context = {
             'has_calendar_access': self.is_available(),
@@ -254,11 +414,85 @@ class GoogleCalendarManager:
         }
         
         return context
+    
+    def get_calendar_context_for_planning(self) -> Dict[str, Any]:
+        """Get calendar context for daily planning"""
+        now = datetime.now()
+        return self._build_planning_context(self._fetch_planning_events(now), now)
+    
+    def _fetch_overview_events(self, now: datetime, hours: int) -> List[CalendarEvent]:
+        """Fetch events from the start of today through the given number of hours"""
+        if not self.service:
+            return []
+        
+        start_of_day, _ = _day_bounds(now)
+        
+        # One request covers today and the days after it; the service's HTTP
+        # connection can't be shared by concurrent requests
+        try:
+            return self._cached(
+                ("overview", hours, int(time.time() // 60)),
+                self._CACHE_TTL,
+                lambda: self._fetch_window(start_of_day, now + timedelta(hours=hours))
+            )
+        except _google('HttpError') as error:
+            logger.error(f"An error occurred retrieving calendar overview: {error}")
+            return []
+    
+    def _split_overview(self, events: List[CalendarEvent], now: datetime) -> Tuple[List[CalendarEvent], List[CalendarEvent]]:
+        """Split fetched events into today's events and those starting after today"""
+        _, end_of_day = _day_bounds(now)
+        today_events = [e for e in events if self._to_local_naive(e.start_time) <= end_of_day]
+        later_events = [e for e in events if self._to_local_naive(e.start_time) > end_of_day]
+        return today_events, later_events
+    
+    def get_calendar_overview(self, hours: int = 48) -> Tuple[List[CalendarEvent], List[CalendarEvent]]:
+        """Get today's events and the events after today within the next hours"""
+        now = datetime.now()
+        return self._split_overview(self._fetch_overview_events(now, hours), now)
+    
+    # Async variants run the blocking HTTP calls in a worker thread so they
+    # don't stall the event loop (scheduler, Telegram handlers)
+    
+    async def aget_todays_events(self) -> List[CalendarEvent]:
+        """Get today's calendar events without blocking the event loop"""
+        return await asyncio.to_thread(self.get_todays_events)
+    
+    async def aget_upcoming_events(self, hours: int = 24) -> List[CalendarEvent]:
+        """Get upcoming events without blocking the event loop"""
+        return await asyncio.to_thread(self.get_upcoming_events, hours)
+    
+    async def aget_next_event(self) -> Optional[CalendarEvent]:
+        """Get the next upcoming event without blocking the event loop"""
+        return await asyncio.to_thread(self.get_next_event)
+    
+    async def aget_calendar_overview(self, hours: int = 48) -> Tuple[List[CalendarEvent], List[CalendarEvent]]:
+        """Get today's and later events without blocking the event loop"""
+        now = datetime.now()
+        events = await asyncio.to_thread(self._fetch_overview_events, now, hours)
+        return self._split_overview(events, now)
+    
+    async def aget_calendar_context_for_planning(self) -> Dict[str, Any]:
+        """Get calendar context for daily planning without blocking the event loop"""
+        now = datetime.now()
+        events = await asyncio.to_thread(self._fetch_planning_events, now)
+        return self._build_planning_context(events, now)
+
+
+_MANAGER_CACHE: Dict[str, GoogleCalendarManager] = {}
 
 
 def create_google_calendar_manager(user_id: str = "alex") -> GoogleCalendarManager:
-    """Factory function to create a Google Calendar manager"""
-    return GoogleCalendarManager(user_id)
+    """Factory function to create a Google Calendar manager, reused per user once authorized"""
+    manager = _MANAGER_CACHE.get(user_id)
+    if manager is not None and manager.is_available():
+        return manager
+    
+    manager = GoogleCalendarManager(user_id)
+    if manager.is_available():
+        # Only cache authorized managers so setup can be retried later
+        _MANAGER_CACHE[user_id] = manager
+    return manager
 
 
 def setup_google_calendar_instructions() -> str:
@@ -2,63 +2,314 @@
 Scheduler module for automatic daily cycle progression and time-based check-ins
 """
 import asyncio
+import atexit
+import heapq
 import json
 import logging
+import os
+import tempfile
+import threading
+import time as _time
+import weakref
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, time, timedelta
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Set, Tuple, ClassVar, Deque
 from pathlib import Path
+from types import MappingProxyType
 
 from models.agent_state import create_initial_state
 from models.user import User
 from utils.telegram_bot import TelegramBotInterface
 from utils.timezone_helper import get_local_time_naive, format_time_for_user
 
+# orjson is optional; it serializes and parses several times faster than json
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _json_default(obj: Any) -> str:
+        # Match orjson, which writes dates and times in ISO 8601 form
+        if hasattr(obj, "isoformat"):
+            return obj.isoformat()
+        return str(obj)
+    
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=_json_default).encode()
+    
+    _loads = json.loads
+
+
+# Directories already created by this process
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def _ensure_dir(path: Path):
+    """Create a directory (and parents) once per process"""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+# Phases of the daily cycle, in order, and each phase's position in it
+PHASE_ORDER = (
+    "morning_planning",
+    "morning_checkin",
+    "midday_checkin",
+    "evening_checkin",
+    "nighttime_planning"
+)
+PHASE_INDEX: Dict[str, int] = {phase: i for i, phase in enumerate(PHASE_ORDER)}
+
+# Phases skipped when jumping from one phase (key[0]) to a later one (key[1])
+MISSED_PHASES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    (current, expected): PHASE_ORDER[ci + 1:ei]
+    for ci, current in enumerate(PHASE_ORDER)
+    for ei, expected in enumerate(PHASE_ORDER)
+    if ei > ci + 1
+}
+
+# Human-readable phase names for messages
+PHASE_DISPLAY: Dict[str, str] = {phase: phase.replace('_', ' ') for phase in PHASE_ORDER}
+
+# Reminder sent ahead of an upcoming phase: (phase display name, minutes until)
+NUDGE_TEMPLATE = "💙 Gentle reminder: Your {} is coming up in {} minutes. No pressure! 🌱"
+
+# Most recent nudges kept in the scheduler state
+NUDGE_HISTORY_LIMIT = 50
+
+# Days of missed check-ins kept in the scheduler state
+MISSED_CHECK_IN_DAYS = 30
+
 
-class SchedulerState:
+class _WeakRefSlot:
+    """Slotted base that gives slotted dataclasses a __weakref__ slot"""
+    __slots__ = ("__weakref__",)
+
+
+@dataclass(slots=True)
+class SchedulerState(_WeakRefSlot):
     """Manages scheduler state persistence"""
     
-    def __init__(self, user_id: str):
-        self.user_id = user_id
-        self.state_file = Path(f"data/users/{user_id}/scheduler_state.json")
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        self._state = self._load_state()
+    user_id: str
+    current_phase: str = "morning_planning"
+    daily_cycle_count: int = 0
+    last_phase_transition: Optional[str] = None
+    last_check_in_times: Dict[str, str] = field(default_factory=dict)
+    missed_check_ins: List[Dict[str, Any]] = field(default_factory=list)
+    nudge_history: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=NUDGE_HISTORY_LIMIT)
+    )
+    last_nudge_for: Dict[str, str] = field(default_factory=dict)
+    state_file: Path = field(init=False, repr=False)
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _last_flush: float = field(default=0.0, init=False, repr=False)
+    _flush_handle: Optional[asyncio.TimerHandle] = field(default=None, init=False, repr=False)
+    _flush_loop: Optional[asyncio.AbstractEventLoop] = field(default=None, init=False, repr=False)
+    _flush_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _snapshot_seq: int = field(default=0, init=False, repr=False)
+    _written_seq: int = field(default=0, init=False, repr=False)
+    
+    # Fields persisted to the state file
+    PERSISTED_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "last_phase_transition",
+        "current_phase",
+        "daily_cycle_count",
+        "last_check_in_times",
+        "missed_check_ins",
+        "nudge_history",
+        "last_nudge_for"
+    )
     
-    def _load_state(self) -> Dict[str, Any]:
-        """Load scheduler state from file"""
+    # Minimum seconds between state file writes; pending changes are
+    # written by a deferred flush when an event loop is running, and by
+    # flush() on phase transitions, scheduler stop and exit
+    FLUSH_INTERVAL: ClassVar[float] = 5.0
+    
+    def __post_init__(self):
+        self.state_file = Path(f"data/users/{self.user_id}/scheduler_state.json")
+        _ensure_dir(self.state_file.parent)
+        self._load_state()
+        _LIVE_STATES[id(self)] = self
+    
+    def _load_state(self):
+        """Load scheduler state from file, keeping defaults for missing fields"""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                data = _loads(self.state_file.read_bytes())
             except (json.JSONDecodeError, FileNotFoundError):
-                pass
+                return
+            
+            for key in self.PERSISTED_FIELDS:
+                if key in data:
+                    self._set_field(key, data[key])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the persisted state as a plain dict"""
+        data = {key: getattr(self, key) for key in self.PERSISTED_FIELDS}
+        data["nudge_history"] = list(self.nudge_history)
+        return data
+    
+    def _trim_missed_check_ins(self):
+        """Drop missed check-in records older than MISSED_CHECK_IN_DAYS"""
+        cutoff = (get_local_time_naive().date() - timedelta(days=MISSED_CHECK_IN_DAYS)).isoformat()
+        self.missed_check_ins = [
+            record for record in self.missed_check_ins
+            if record.get("missed_date", cutoff) >= cutoff
+        ]
+    
+    def _save_state(self, payload: bytes, seq: int):
+        """Write serialized scheduler state to file atomically
         
-        return {
-            "last_phase_transition": None,
-            "current_phase": "morning_planning",
-            "daily_cycle_count": 0,
-            "last_check_in_times": {},
-            "missed_check_ins": [],
-            "nudge_history": []
-        }
+        flush() on the loop thread can overlap an aflush() write in a worker
+        thread, so writes are serialized and a snapshot older than the one
+        already written is dropped. Each write gets its own temp file.
+        """
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.state_file.parent, prefix=self.state_file.name + ".", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as tmp_file:
+                    tmp_file.write(payload)
+                os.replace(tmp_name, self.state_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+            self._written_seq = seq
+    
+    def _mark_dirty(self) -> bool:
+        """Record a pending change; returns True if it should be written now
+        
+        Otherwise the write is deferred to the end of the flush interval when
+        an event loop is running.
+        """
+        self._dirty = True
+        remaining = self.FLUSH_INTERVAL - (_time.monotonic() - self._last_flush)
+        if remaining <= 0:
+            return True
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False  # No loop to defer to; flush() or exit will write it
+        
+        # A timer left on a loop that has since closed (or on another loop)
+        # will never fire here, so it doesn't count as a scheduled flush
+        if self._flush_handle is not None and (
+            self._flush_loop is not loop or self._flush_handle.cancelled()
+        ):
+            self._flush_handle = None
+        
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(remaining, self._start_deferred_flush)
+            self._flush_loop = loop
+        return False
+    
+    def _start_deferred_flush(self):
+        """Timer callback: write pending changes without blocking the loop"""
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.aflush())
+    
+    def _take_pending(self) -> Optional[Tuple[bytes, int]]:
+        """Cancel any deferred write and serialize pending changes, if any
+        
+        Serializing here, on the caller's thread, means later changes can't
+        race a write running in a worker thread. Returns the payload and its
+        snapshot number.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty:
+            return None
+        
+        self._trim_missed_check_ins()
+        payload = _dumps(self.to_dict())
+        self._dirty = False
+        self._last_flush = _time.monotonic()
+        self._snapshot_seq += 1
+        return payload, self._snapshot_seq
+    
+    def flush(self):
+        """Write pending changes to disk"""
+        pending = self._take_pending()
+        if pending is not None:
+            self._save_state(*pending)
     
-    def _save_state(self):
-        """Save scheduler state to file"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self._state, f, indent=2, default=str)
+    async def aflush(self):
+        """Write pending changes to disk from a worker thread"""
+        pending = self._take_pending()
+        if pending is not None:
+            await asyncio.to_thread(self._save_state, *pending)
     
     def get(self, key: str, default=None):
         """Get state value"""
-        return self._state.get(key, default)
+        if key not in self.PERSISTED_FIELDS:
+            return default
+        return getattr(self, key)
     
     def set(self, key: str, value: Any):
         """Set state value and save"""
-        self._state[key] = value
-        self._save_state()
+        self._set_field(key, value)
+        if self._mark_dirty():
+            self.flush()
     
     def update(self, updates: Dict[str, Any]):
         """Update multiple state values"""
-        self._state.update(updates)
-        self._save_state()
+        for key, value in updates.items():
+            self._set_field(key, value)
+        if self._mark_dirty():
+            self.flush()
+    
+    async def aset(self, key: str, value: Any):
+        """Set state value and save without blocking the event loop"""
+        self._set_field(key, value)
+        if self._mark_dirty():
+            await self.aflush()
+    
+    async def aupdate(self, updates: Dict[str, Any]):
+        """Update multiple state values without blocking the event loop"""
+        for key, value in updates.items():
+            self._set_field(key, value)
+        if self._mark_dirty():
+            await self.aflush()
+    
+    def _set_field(self, key: str, value: Any):
+        """Set a persisted field, rejecting unknown keys"""
+        if key not in self.PERSISTED_FIELDS:
+            raise KeyError(f"Unknown scheduler state field: {key}")
+        if key == "nudge_history" and not isinstance(value, deque):
+            value = deque(value, maxlen=NUDGE_HISTORY_LIMIT)
+        setattr(self, key, value)
+
+
+# States that may still hold unsaved changes, held weakly so discarded
+# schedulers can be collected; one exit hook flushes whichever remain
+_LIVE_STATES: "weakref.WeakValueDictionary[int, SchedulerState]" = weakref.WeakValueDictionary()
+
+
+@atexit.register
+def _flush_live_states():
+    """Write pending changes of every live SchedulerState at interpreter exit"""
+    for state in list(_LIVE_STATES.values()):
+        try:
+            state.flush()
+        except Exception:
+            logging.getLogger(f"scheduler.{state.user_id}").exception(
+                "Failed to save scheduler state at exit"
+            )
 
 
 class DailyScheduler:
@@ -66,14 +317,21 @@ class DailyScheduler:
     Handles automatic daily cycle progression and time-based check-ins
     """
     
-    # Default schedule times (can be customized per user)
-    DEFAULT_SCHEDULE = {
+    # Phases of the daily cycle, in order
+    PHASES = PHASE_ORDER
+    
+    # Phase that follows each phase, wrapping back to the start of the day
+    _NEXT_PHASE = dict(zip(PHASES, PHASES[1:] + PHASES[:1]))
+    
+    # Default schedule times (can be customized per user); read-only so
+    # instances can't mutate the shared defaults
+    DEFAULT_SCHEDULE = MappingProxyType({
         "morning_planning": time(7, 0),     # 7:00 AM
         "morning_checkin": time(9, 0),      # 9:00 AM
         "midday_checkin": time(13, 0),      # 1:00 PM
         "evening_checkin": time(18, 0),     # 6:00 PM
         "nighttime_planning": time(21, 0)   # 9:00 PM
-    }
+    })
     
     # Grace periods for check-ins (minutes)
     GRACE_PERIODS = {
@@ -84,14 +342,27 @@ class DailyScheduler:
         "nighttime_planning": 120   # 2 hours
     }
     
+    # How long before a phase starts to send the gentle reminder (minutes)
+    NUDGE_LEAD_MINUTES = 30
+    
+    # Longest the loop sleeps between checks, so wall-clock jumps are noticed
+    MAX_SLEEP_SECONDS = 3600
+    
+    # How soon to retry an overdue transition that failed (seconds)
+    TRANSITION_RETRY_SECONDS = 300
+    
+    # How soon to re-check after a nudge couldn't be delivered (seconds)
+    NUDGE_RETRY_SECONDS = 60
+    
     def __init__(self, user_id: str = "alex", telegram_bot: Optional[TelegramBotInterface] = None):
         self.user_id = user_id
         self.state = SchedulerState(user_id)
-        self.telegram_bot = telegram_bot or TelegramBotInterface()
+        self.telegram_bot = telegram_bot or TelegramBotInterface.get_instance()
         self.logger = logging.getLogger(f"scheduler.{user_id}")
         
         # Load user's custom schedule if available
         self.schedule = self._load_user_schedule()
+        self._index_schedule()
         
         # Workflow node functions (will be set when integrating with main app)
         self.workflow_nodes: Dict[str, Callable] = {}
@@ -99,14 +370,26 @@ class DailyScheduler:
         # Running flag
         self.is_running = False
         
+        # Set to interrupt the scheduler's sleep (schedule edits, stop)
+        self._wake = asyncio.Event()
+        
+        # Results of time-dependent checks, reused within the same minute
+        self._tick_cache: Dict[Tuple, Any] = {}
+        
+        # Telegram sends still in flight; held so the tasks aren't collected early
+        self._pending_sends: Set[asyncio.Task] = set()
+        
+        # (phase, start time) of reminders being sent, so a check while one is
+        # in flight doesn't queue a duplicate
+        self._nudges_in_flight: Set[Tuple[str, str]] = set()
+        
     def _load_user_schedule(self) -> Dict[str, time]:
         """Load user's custom schedule or use defaults"""
         user_schedule_file = Path(f"data/users/{self.user_id}/schedule.json")
         
         if user_schedule_file.exists():
             try:
-                with open(user_schedule_file, 'r') as f:
-                    schedule_data = json.load(f)
+                schedule_data = _loads(user_schedule_file.read_bytes())
                 
                 # Convert time strings back to time objects
                 schedule = {}
@@ -114,13 +397,33 @@ class DailyScheduler:
                     hour, minute = map(int, time_str.split(':'))
                     schedule[phase] = time(hour, minute)
                 
-                self.logger.info(f"Loaded custom schedule for {self.user_id}")
+                self.logger.info("Loaded custom schedule for %s", self.user_id)
                 return schedule
             except (json.JSONDecodeError, ValueError, FileNotFoundError):
-                self.logger.warning(f"Error loading custom schedule, using defaults")
+                self.logger.warning("Error loading custom schedule, using defaults")
         
         return self.DEFAULT_SCHEDULE.copy()
     
+    def _index_schedule(self):
+        """Precompute the schedule sorted by time of day for fast lookups"""
+        self._sorted_phases: List[Tuple[str, time]] = sorted(self.schedule.items(), key=lambda x: x[1])
+        self._sorted_keys: List[int] = [
+            t.hour * 3600 + t.minute * 60 + t.second for _, t in self._sorted_phases
+        ]
+    
+    @staticmethod
+    def _tick_key() -> int:
+        """Current minute bucket; time-based check results only change per minute"""
+        return int(_time.time() // 60)
+    
+    def _cache_tick_result(self, key: Tuple, value: Any) -> Any:
+        """Store a per-minute result, dropping entries from earlier minutes"""
+        if len(self._tick_cache) > 32:
+            tick = key[-1]
+            self._tick_cache = {k: v for k, v in self._tick_cache.items() if k[-1] == tick}
+        self._tick_cache[key] = value
+        return value
+    
     def set_workflow_nodes(self, nodes: Dict[str, Callable]):
         """Set the workflow node functions"""
         self.workflow_nodes = nodes
@@ -131,137 +434,190 @@ class DailyScheduler:
             raise ValueError(f"Invalid phase: {phase}")
         
         self.schedule[phase] = new_time
+        self._index_schedule()
+        self._tick_cache.clear()
+        self._wake.set()
         self._save_user_schedule()
-        self.logger.info(f"Updated {phase} schedule to {new_time}")
+        self.logger.info("Updated %s schedule to %s", phase, new_time)
     
     def _save_user_schedule(self):
         """Save user's custom schedule"""
         user_schedule_file = Path(f"data/users/{self.user_id}/schedule.json")
-        user_schedule_file.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(user_schedule_file.parent)
         
         # Convert time objects to strings for JSON serialization
         schedule_data = {
             phase: t.strftime("%H:%M") for phase, t in self.schedule.items()
         }
         
-        with open(user_schedule_file, 'w') as f:
-            json.dump(schedule_data, f, indent=2)
+        user_schedule_file.write_bytes(_dumps(schedule_data))
     
     def get_next_phase(self, current_phase: str) -> str:
         """Get the next phase in the daily cycle"""
-        phase_order = [
-            "morning_planning",
-            "morning_checkin", 
-            "midday_checkin",
-            "evening_checkin",
-            "nighttime_planning"
-        ]
-        
-        try:
-            current_index = phase_order.index(current_phase)
-            next_index = (current_index + 1) % len(phase_order)
-            return phase_order[next_index]
-        except ValueError:
-            return "morning_planning"  # Default fallback
+        return self._NEXT_PHASE.get(current_phase, "morning_planning")
     
-    def get_current_expected_phase(self) -> str:
+    def get_current_expected_phase(self, now: Optional[datetime] = None) -> str:
         """Determine what phase should be active based on current time"""
-        now = get_local_time_naive().time()
-        
-        # Sort phases by time
-        sorted_phases = sorted(self.schedule.items(), key=lambda x: x[1])
-        
-        # Start with the last phase as default (for early morning hours)
-        current_expected = sorted_phases[-1][0]
+        if now is None:
+            now = get_local_time_naive()
         
-        for phase, phase_time in sorted_phases:
-            if now >= phase_time:
-                current_expected = phase
-            else:
-                break
+        # Last phase whose time has passed; index -1 wraps to the last phase
+        # of the day for early morning hours
+        return self._sorted_phases[self._locate(now) - 1][0]
+    
+    def _locate(self, now: datetime) -> int:
+        """Index of the first phase scheduled strictly after now's time of day"""
+        now_sec = now.hour * 3600 + now.minute * 60 + now.second
+        return bisect_right(self._sorted_keys, now_sec)
+    
+    def _evaluate(self, now: datetime, current_phase: str) -> Tuple[str, bool, str, datetime]:
+        """Everything check_and_handle_transitions needs from one schedule lookup
         
-        return current_expected
+        Returns the expected phase, whether current_phase is overdue, and the
+        next phase with its start time.
+        """
+        idx = self._locate(now)
+        expected_phase = self._sorted_phases[idx - 1][0]
+        overdue = current_phase in self.schedule and now > self._overdue_at(current_phase, now)
+        next_phase, next_at = self._next_phase_at(now, idx)
+        return expected_phase, overdue, next_phase, next_at
     
     def is_check_in_overdue(self, phase: str) -> bool:
         """Check if a phase check-in is overdue"""
         if phase not in self.schedule:
             return False
         
+        key = ("overdue", phase, self._tick_key())
+        if key in self._tick_cache:
+            return self._tick_cache[key]
+        
+        now = get_local_time_naive()
+        return self._cache_tick_result(key, now > self._overdue_at(phase, now))
+    
+    def _overdue_at(self, phase: str, now: datetime) -> datetime:
+        """When the most recent occurrence of a phase becomes overdue"""
         scheduled_time = self.schedule[phase]
         grace_period = self.GRACE_PERIODS.get(phase, 180)  # Default 3 hours
         
-        now = get_local_time_naive()
         scheduled_datetime = datetime.combine(now.date(), scheduled_time)
         
         # If scheduled time was yesterday and we're past midnight
         if scheduled_datetime > now:
             scheduled_datetime -= timedelta(days=1)
         
-        overdue_time = scheduled_datetime + timedelta(minutes=grace_period)
+        return scheduled_datetime + timedelta(minutes=grace_period)
+    
+    def _next_phase_at(self, now: datetime, idx: Optional[int] = None) -> Tuple[str, datetime]:
+        """First phase scheduled strictly after now, rolling over to tomorrow"""
+        if idx is None:
+            idx = self._locate(now)
+        
+        next_date = now.date()
+        if idx == len(self._sorted_phases):
+            idx = 0
+            next_date += timedelta(days=1)
+        
+        phase, phase_time = self._sorted_phases[idx]
+        return phase, datetime.combine(next_date, phase_time)
+    
+    def _next_wake_at(self, now: datetime) -> datetime:
+        """Earliest instant at which check_and_handle_transitions could act"""
+        _, next_at = self._next_phase_at(now)
+        wake_at = next_at
+        
+        # Start of the reminder window for the upcoming phase
+        nudge_at = next_at - timedelta(minutes=self.NUDGE_LEAD_MINUTES)
+        if nudge_at > now:
+            wake_at = min(wake_at, nudge_at)
         
-        return now > overdue_time
+        # Moment the current phase becomes overdue, if it hasn't yet; if it
+        # already has and we're still behind, the transition failed, so retry
+        current_phase = self.state.get("current_phase", "morning_planning")
+        if current_phase in self.schedule:
+            overdue_at = self._overdue_at(current_phase, now)
+            if overdue_at > now:
+                wake_at = min(wake_at, overdue_at)
+            elif self.get_current_expected_phase(now) != current_phase:
+                wake_at = min(wake_at, now + timedelta(seconds=self.TRANSITION_RETRY_SECONDS))
+        
+        return wake_at
     
     def get_time_until_next_phase(self) -> Optional[Dict[str, Any]]:
         """Get time until next scheduled phase"""
-        now = get_local_time_naive()
-        current_time = now.time()
-        
-        # Find next scheduled phase
-        upcoming_phases = []
-        for phase, phase_time in self.schedule.items():
-            phase_datetime = datetime.combine(now.date(), phase_time)
-            
-            # If the time has passed today, schedule for tomorrow
-            if phase_time <= current_time:
-                phase_datetime += timedelta(days=1)
-            
-            upcoming_phases.append((phase, phase_datetime))
+        key = ("ttn", self._tick_key())
+        if key in self._tick_cache:
+            return self._tick_cache[key]
         
-        if not upcoming_phases:
+        if not self._sorted_phases:
             return None
         
-        # Sort by time and get the next one
-        upcoming_phases.sort(key=lambda x: x[1])
-        next_phase, next_datetime = upcoming_phases[0]
-        
+        # Walk the presorted schedule instead of rebuilding and sorting it
+        now = get_local_time_naive()
+        next_phase, next_datetime = self._next_phase_at(now)
         time_delta = next_datetime - now
         
-        return {
+        return self._cache_tick_result(key, {
             "phase": next_phase,
             "datetime": next_datetime,
             "time_delta": time_delta,
             "minutes_until": int(time_delta.total_seconds() / 60)
-        }
+        })
     
-    async def send_gentle_nudge(self, phase: str, message: str):
-        """Send a gentle awareness nudge via Telegram"""
+    async def send_gentle_nudge(self, phase: str, message: str,
+                                nudge_for: Optional[Tuple[str, str]] = None) -> Optional[asyncio.Task]:
+        """Send a gentle awareness nudge via Telegram
+        
+        nudge_for is the (phase, start time) the reminder is about; it's
+        recorded in last_nudge_for once the message is delivered.
+        """
         try:
-            await self.telegram_bot.send_message(message)
-            
-            # Log the nudge
-            nudge_record = {
-                "timestamp": get_local_time_naive().isoformat(),
-                "phase": phase,
-                "message": message
-            }
-            
-            nudge_history = self.state.get("nudge_history", [])
-            nudge_history.append(nudge_record)
-            
-            # Keep only last 50 nudges
-            if len(nudge_history) > 50:
-                nudge_history = nudge_history[-50:]
-            
-            self.state.set("nudge_history", nudge_history)
-            self.logger.info(f"Sent gentle nudge for {phase}")
+            # Send in the background so a slow Telegram round trip (and its
+            # retries) doesn't hold up the scheduler; yield once so the send
+            # starts now
+            task = asyncio.create_task(self._deliver_nudge(phase, message, nudge_for))
+            self._pending_sends.add(task)
+            task.add_done_callback(self._pending_sends.discard)
+            if nudge_for is not None:
+                self._nudges_in_flight.add(nudge_for)
+                task.add_done_callback(lambda _: self._nudges_in_flight.discard(nudge_for))
+            await asyncio.sleep(0)
+            self.logger.info("Queued gentle nudge for %s", phase)
+            return task
             
         except Exception as e:
-            self.logger.error(f"Failed to send nudge: {e}")
+            self.logger.error("Failed to send nudge: %s", e)
+            return None
+    
+    async def _deliver_nudge(self, phase: str, message: str,
+                             nudge_for: Optional[Tuple[str, str]]) -> bool:
+        """Send a nudge and record it only once Telegram has accepted it"""
+        if not await self.telegram_bot.send_message(message):
+            # Check again shortly; the reminder is still unrecorded, so the
+            # next check sends it again if it's still due
+            self.logger.warning("Gentle nudge for %s was not delivered", phase)
+            asyncio.get_running_loop().call_later(self.NUDGE_RETRY_SECONDS, self._wake.set)
+            return False
+        
+        # nudge_history is bounded, so old nudges fall off as new ones arrive
+        nudge_history = self.state.get("nudge_history", [])
+        nudge_history.append({
+            "timestamp": get_local_time_naive().isoformat(),
+            "phase": phase,
+            "message": message
+        })
+        await self.state.aset("nudge_history", nudge_history)
+        
+        if nudge_for is not None:
+            next_phase, target_iso = nudge_for
+            last_nudge_for = self.state.get("last_nudge_for", {})
+            last_nudge_for[next_phase] = target_iso
+            await self.state.aset("last_nudge_for", last_nudge_for)
+        return True
     
     async def trigger_phase_transition(self, target_phase: str):
         """Trigger a phase transition via workflow"""
         if target_phase not in self.workflow_nodes:
-            self.logger.error(f"No workflow node available for phase: {target_phase}")
+            self.logger.error("No workflow node available for phase: %s", target_phase)
             return False
         
         try:
@@ -275,83 +631,107 @@ class DailyScheduler:
             updated_state = await workflow_func(agent_state)
             
             # Update scheduler state
-            self.state.update({
-                "last_phase_transition": get_local_time_naive().isoformat(),
+            now_iso = get_local_time_naive().isoformat()
+            await self.state.aupdate({
+                "last_phase_transition": now_iso,
                 "current_phase": target_phase
             })
             
             # Record check-in time
             check_in_times = self.state.get("last_check_in_times", {})
-            check_in_times[target_phase] = get_local_time_naive().isoformat()
-            self.state.set("last_check_in_times", check_in_times)
+            check_in_times[target_phase] = now_iso
+            await self.state.aset("last_check_in_times", check_in_times)
+            await self.state.aflush()
             
-            self.logger.info(f"Successfully transitioned to {target_phase}")
+            self.logger.info("Successfully transitioned to %s", target_phase)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to transition to {target_phase}: {e}")
+            self.logger.error("Failed to transition to %s: %s", target_phase, e)
             return False
     
-    async def check_and_handle_transitions(self):
-        """Check if any phase transitions should occur and handle them"""
-        expected_phase = self.get_current_expected_phase()
+    async def check_and_handle_transitions(self) -> datetime:
+        """Check if any phase transitions should occur and handle them
+        
+        Returns the next instant at which there may be something to do.
+        """
+        now = get_local_time_naive()
         current_phase = self.state.get("current_phase", "morning_planning")
+        expected_phase, overdue, next_phase, next_at = self._evaluate(now, current_phase)
         
         # If we're behind schedule, check if we should transition
         if expected_phase != current_phase:
             # Check if current phase is overdue
-            if self.is_check_in_overdue(current_phase):
-                self.logger.info(f"Phase {current_phase} is overdue, transitioning to {expected_phase}")
+            if overdue:
+                self.logger.info("Phase %s is overdue, transitioning to %s", current_phase, expected_phase)
                 
                 # Add to missed check-ins if we're skipping phases
-                phase_order = ["morning_planning", "morning_checkin", "midday_checkin", "evening_checkin", "nighttime_planning"]
-                current_idx = phase_order.index(current_phase) if current_phase in phase_order else 0
-                expected_idx = phase_order.index(expected_phase) if expected_phase in phase_order else 0
-                
-                if expected_idx > current_idx + 1:
-                    # We're skipping phases
-                    missed_phases = phase_order[current_idx + 1:expected_idx]
+                missed_phases = MISSED_PHASES.get((current_phase, expected_phase))
+                if missed_phases:
+                    missed_date = now.date().isoformat()
                     missed_check_ins = self.state.get("missed_check_ins", [])
-                    missed_check_ins.extend([{
-                        "phase": phase,
-                        "missed_date": get_local_time_naive().date().isoformat()
-                    } for phase in missed_phases])
-                    self.state.set("missed_check_ins", missed_check_ins)
+                    missed_check_ins.extend(
+                        {"phase": phase, "missed_date": missed_date} for phase in missed_phases
+                    )
+                    await self.state.aset("missed_check_ins", missed_check_ins)
                 
                 await self.trigger_phase_transition(expected_phase)
             else:
-                # Send gentle nudge for upcoming transition
-                time_info = self.get_time_until_next_phase()
-                if time_info and time_info["minutes_until"] <= 30:  # 30 min warning
-                    nudge_message = f"💙 Gentle reminder: Your {time_info['phase'].replace('_', ' ')} is coming up in {time_info['minutes_until']} minutes. No pressure! 🌱"
-                    await self.send_gentle_nudge(current_phase, nudge_message)
+                # Send gentle nudge for upcoming transition, once per occurrence
+                minutes_until = int((next_at - now).total_seconds() / 60)
+                nudge_for = (next_phase, next_at.isoformat())
+                already_nudged = (
+                    self.state.get("last_nudge_for", {}).get(next_phase) == nudge_for[1]
+                    or nudge_for in self._nudges_in_flight
+                )
+                if minutes_until <= self.NUDGE_LEAD_MINUTES and not already_nudged:
+                    display_name = PHASE_DISPLAY.get(next_phase) or next_phase.replace('_', ' ')
+                    nudge_message = NUDGE_TEMPLATE.format(display_name, minutes_until)
+                    await self.send_gentle_nudge(current_phase, nudge_message, nudge_for)
+        
+        # Transitions and nudges await I/O, so measure from after them
+        return self._next_wake_at(get_local_time_naive())
+    
+    async def _sleep_until(self, wake_at: datetime):
+        """Sleep until wake_at, or until woken early by a schedule change or stop"""
+        delay = (wake_at - get_local_time_naive()).total_seconds()
+        delay = min(max(delay, 1), self.MAX_SLEEP_SECONDS)
+        
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
     
     async def start_scheduler(self):
         """Start the scheduler main loop"""
         self.is_running = True
-        self.logger.info(f"Starting scheduler for {self.user_id}")
+        self.logger.info("Starting scheduler for %s", self.user_id)
         
         while self.is_running:
             try:
-                await self.check_and_handle_transitions()
+                wake_at = await self.check_and_handle_transitions()
                 
-                # Sleep for 5 minutes before next check
-                await asyncio.sleep(300)  # 5 minutes
+                # Sleep until the next phase, reminder or overdue deadline
+                await self._sleep_until(wake_at)
                 
             except Exception as e:
-                self.logger.error(f"Error in scheduler loop: {e}")
+                self.logger.error("Error in scheduler loop: %s", e)
                 await asyncio.sleep(60)  # Shorter sleep on error
     
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.is_running = False
-        self.logger.info(f"Stopping scheduler for {self.user_id}")
+        self._wake.set()
+        self.state.flush()
+        self.logger.info("Stopping scheduler for %s", self.user_id)
     
     def get_schedule_status(self) -> Dict[str, Any]:
         """Get current schedule status"""
         now = get_local_time_naive()
+        today_iso = now.date().isoformat()
         current_phase = self.state.get("current_phase", "morning_planning")
-        expected_phase = self.get_current_expected_phase()
+        expected_phase = self.get_current_expected_phase(now)
         
         return {
             "current_time": now.isoformat(),
@@ -363,7 +743,7 @@ class DailyScheduler:
             "last_transition": self.state.get("last_phase_transition"),
             "missed_check_ins_today": [
                 record for record in self.state.get("missed_check_ins", [])
-                if record.get("missed_date") == now.date().isoformat()
+                if record.get("missed_date") == today_iso
             ]
         }
 
@@ -374,30 +754,90 @@ class SchedulerManager:
     def __init__(self):
         self.schedulers: Dict[str, DailyScheduler] = {}
         self.logger = logging.getLogger("scheduler_manager")
+        self.is_running = False
+        
+        # Shared with managed schedulers; set when the run queue must be rebuilt
+        self._wake = asyncio.Event()
     
     def get_scheduler(self, user_id: str) -> DailyScheduler:
         """Get or create scheduler for user"""
-        if user_id not in self.schedulers:
-            self.schedulers[user_id] = DailyScheduler(user_id)
-            self.logger.info(f"Created scheduler for user: {user_id}")
+        scheduler = self.schedulers.get(user_id)
+        if scheduler is None:
+            # setdefault keeps the first scheduler if another thread won the race
+            scheduler = self.schedulers.setdefault(user_id, DailyScheduler(user_id))
+            self.logger.info("Created scheduler for user: %s", user_id)
+            if self.is_running:
+                self._adopt(scheduler)
+                self._wake.set()
+        
+        return scheduler
+    
+    def _adopt(self, scheduler: DailyScheduler):
+        """Mark a scheduler as driven by run() and route its wake-ups here"""
+        scheduler.is_running = True
+        scheduler._wake = self._wake
+    
+    async def run(self):
+        """Drive every scheduler from one loop, waking only when the soonest user is due
+        
+        Each scheduler's next wake time sits in a heap, so a tick costs
+        O(log users) for the users that are actually due instead of one
+        sleeping task per user.
+        """
+        self.is_running = True
+        for scheduler in self.schedulers.values():
+            self._adopt(scheduler)
+        
+        heap: List[Tuple[datetime, str]] = []
+        self._wake.set()
         
-        return self.schedulers[user_id]
+        while self.is_running:
+            if self._wake.is_set():
+                # Schedulers were added or a schedule changed; re-check everyone now
+                self._wake.clear()
+                now = get_local_time_naive()
+                heap = [
+                    (now, user_id) for user_id, scheduler in self.schedulers.items()
+                    if scheduler.is_running
+                ]
+                heapq.heapify(heap)
+            
+            now = get_local_time_naive()
+            while self.is_running and heap and heap[0][0] <= now:
+                _, user_id = heapq.heappop(heap)
+                scheduler = self.schedulers.get(user_id)
+                if scheduler is None or not scheduler.is_running:
+                    continue
+                
+                try:
+                    wake_at = await scheduler.check_and_handle_transitions()
+                except Exception as e:
+                    self.logger.error("Error in scheduler loop for %s: %s", user_id, e)
+                    wake_at = now + timedelta(seconds=60)  # Retry sooner on error
+                heapq.heappush(heap, (wake_at, user_id))
+            
+            max_sleep = DailyScheduler.MAX_SLEEP_SECONDS
+            delay = (heap[0][0] - get_local_time_naive()).total_seconds() if heap else max_sleep
+            delay = min(max(delay, 1), max_sleep)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
     
     async def start_all_schedulers(self):
         """Start all user schedulers"""
-        tasks = []
-        for user_id, scheduler in self.schedulers.items():
-            task = asyncio.create_task(scheduler.start_scheduler())
-            tasks.append(task)
-            self.logger.info(f"Started scheduler task for {user_id}")
+        for user_id in self.schedulers:
+            self.logger.info("Started scheduler task for %s", user_id)
         
-        if tasks:
-            await asyncio.gather(*tasks)
+        await self.run()
     
     def stop_all_schedulers(self):
         """Stop all schedulers"""
-        for scheduler in self.schedulers.values():
+        self.is_running = False
+        schedulers = list(self.schedulers.values())
+        for scheduler in schedulers:
             scheduler.stop_scheduler()
+        self._wake.set()
         self.logger.info("Stopped all schedulers")
 
 
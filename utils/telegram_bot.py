@@ -1,7 +1,9 @@
 import asyncio
 import logging
+from datetime import timedelta
 from typing import Optional, Callable, Dict, Any
 from telegram import Update, Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter
 from telegram.ext import Application, CommandHandler, MessageHandler, ContextTypes, filters
 import os
 from dotenv import load_dotenv
@@ -12,6 +14,18 @@ logger = logging.getLogger(__name__)
 
 
 class TelegramBotInterface:
+    # Shared instance, see get_instance()
+    _instance: Optional["TelegramBotInterface"] = None
+    
+    # Most messages in flight at once; further sends wait their turn
+    MAX_CONCURRENT_SENDS = 4
+    
+    # Tries per message; timeouts, network errors and flood control are
+    # retried with exponential backoff (seconds), other errors fail at once
+    SEND_ATTEMPTS = 4
+    SEND_RETRY_BASE_DELAY = 1.0
+    SEND_RETRY_MAX_DELAY = 30.0
+    
     def __init__(self):
         self.token = os.getenv("TELEGRAM_TOKEN")
         self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
@@ -19,10 +33,18 @@ class TelegramBotInterface:
         self.application = None
         self.message_handler: Optional[Callable] = None
         self.command_handlers: Dict[str, Callable] = {}
+        self._send_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
         
         if not self.token or not self.chat_id:
             raise ValueError("TELEGRAM_TOKEN and TELEGRAM_CHAT_ID must be set in environment variables")
     
+    @classmethod
+    def get_instance(cls) -> "TelegramBotInterface":
+        """Get the process-wide interface, so senders share one Bot and its connection pool"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
     def set_message_handler(self, handler: Callable[[str, str], str]):
         """Set the handler function for incoming messages"""
         self.message_handler = handler
@@ -66,7 +88,7 @@ Just send me a message and I'll respond based on our current phase of the day!
         user_message = update.message.text
         user_id = str(update.effective_user.id)
         
-        logger.info(f"Received message from {user_id}: {user_message}")
+        logger.info("Received message from %s: %s", user_id, user_message)
         
         try:
             if self.message_handler:
@@ -75,19 +97,43 @@ Just send me a message and I'll respond based on our current phase of the day!
             else:
                 await update.message.reply_text("I'm still setting up. Please try again in a moment!")
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
             await update.message.reply_text("Sorry, I encountered an error. Please try again.")
     
     async def send_message(self, message: str, chat_id: Optional[str] = None) -> bool:
-        """Send a message to the specified chat (or default chat)"""
+        """Send a message to the specified chat (or default chat)
+        
+        Returns whether the message was delivered, after any retries.
+        """
         target_chat_id = chat_id or self.chat_id
-        try:
-            await self.bot.send_message(chat_id=target_chat_id, text=message)
-            logger.info(f"Message sent to {target_chat_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
-            return False
+        backoff = self.SEND_RETRY_BASE_DELAY
+        for attempt in range(1, self.SEND_ATTEMPTS + 1):
+            try:
+                # Only the request holds a send slot, not the wait between tries
+                async with self._send_semaphore:
+                    await self.bot.send_message(chat_id=target_chat_id, text=message)
+                logger.info("Message sent to %s", target_chat_id)
+                return True
+            except RetryAfter as e:
+                # Flood control says how long to wait
+                error, delay = e, e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+            except BadRequest as e:
+                error, delay = e, None
+            except NetworkError as e:
+                error, delay = e, backoff
+            except Exception as e:
+                error, delay = e, None
+            
+            if delay is None or attempt == self.SEND_ATTEMPTS or delay > self.SEND_RETRY_MAX_DELAY:
+                break
+            logger.warning("Send to %s failed (%s), retrying in %.1fs", target_chat_id, error, delay)
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.SEND_RETRY_MAX_DELAY)
+        
+        logger.error("Failed to send message: %s", error)
+        return False
     
     def setup_application(self):
         """Setup the Telegram application with handlers"""
@@ -126,13 +172,13 @@ Just send me a message and I'll respond based on our current phase of the day!
                 await self.application.shutdown()
                 logger.info("Telegram bot stopped")
             except Exception as e:
-                logger.error(f"Error stopping bot: {e}")
+                logger.error("Error stopping bot: %s", e)
 
 
 # Utility functions for easy integration
 async def send_telegram_message(message: str, chat_id: Optional[str] = None) -> bool:
     """Utility function to send a single message"""
-    bot_interface = TelegramBotInterface()
+    bot_interface = TelegramBotInterface.get_instance()
     return await bot_interface.send_message(message, chat_id)
 
 
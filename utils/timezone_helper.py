@@ -2,13 +2,18 @@
 Timezone helper for deployment environments
 """
 import os
-from datetime import datetime, timezone, timedelta
-from typing import Optional
-import pytz
+import time
+from datetime import datetime, timezone, timedelta, tzinfo
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
 
 
 # Pacific timezone
-PACIFIC_TZ = pytz.timezone('America/Los_Angeles')
+DEFAULT_TIMEZONE = 'America/Los_Angeles'
+PACIFIC_TZ = ZoneInfo(DEFAULT_TIMEZONE)
+
+# User timezones, read from the profile once per user
+_user_tz_cache: Dict[str, tzinfo] = {}
 
 
 def set_timezone_for_deployment():
@@ -20,23 +25,39 @@ def set_timezone_for_deployment():
     if target_timezone != os.environ.get('TZ'):
         os.environ['TZ'] = target_timezone
         try:
-            import time
             time.tzset()  # Apply timezone change (Unix systems)
         except (AttributeError, OSError):
             # Windows or some cloud platforms don't support tzset
             pass
 
 
-def get_user_timezone(user_id: str = "alex") -> pytz.BaseTzInfo:
+def get_user_timezone(user_id: str = "alex") -> tzinfo:
     """Get user's timezone from their profile"""
+    user_tz = _user_tz_cache.get(user_id)
+    if user_tz is not None:
+        return user_tz
+    
     try:
         from models.user import User
         user = User.load_or_create(user_id)
-        timezone_str = user.profile.preferences.get("timezone", "America/Los_Angeles")
-        return pytz.timezone(timezone_str)
+        timezone_str = user.profile.preferences.get("timezone", DEFAULT_TIMEZONE)
+        # ZoneInfo keeps its own cache of zone instances
+        user_tz = ZoneInfo(timezone_str)
     except Exception:
-        # Fallback to Pacific if we can't load user profile
+        # Fallback to Pacific if we can't load user profile; not cached so
+        # the profile is retried next time
         return PACIFIC_TZ
+    
+    _user_tz_cache[user_id] = user_tz
+    return user_tz
+
+
+def clear_user_timezone_cache(user_id: Optional[str] = None):
+    """Forget cached user timezones, e.g. after a timezone preference changes"""
+    if user_id is None:
+        _user_tz_cache.clear()
+    else:
+        _user_tz_cache.pop(user_id, None)
 
 
 def get_local_time(user_id: str = "alex") -> datetime:
@@ -65,4 +86,4 @@ def format_time_for_user(dt: Optional[datetime] = None) -> str:
 
 
 # Set timezone on import for deployment
-set_timezone_for_deployment()
\ No newline at end of file
+set_timezone_for_deployment()
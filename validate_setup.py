@@ -3,26 +3,161 @@
 Quick validation script to ensure the assistant is set up correctly
 """
 import os
+import io
 import sys
-import asyncio
-from pathlib import Path
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time
+from importlib import import_module
+from importlib.util import find_spec
+from unittest.mock import patch
+
+from dotenv import load_dotenv
+
+# Load .env before anything below reads the environment; the marker keeps
+# repeat imports (e.g. from tests) from reading the file again
+if not os.environ.get("_MEEBEE_DOTENV_LOADED"):
+    load_dotenv(override=False)
+    os.environ["_MEEBEE_DOTENV_LOADED"] = "1"
+
+
+# What the checks expect to find
+_REQUIRED_ENV = (
+    "TELEGRAM_TOKEN",
+    "OPENAI_API_KEY",
+    "TELEGRAM_CHAT_ID",
+    "TAVILY_API_KEY",
+)
+
+_REQUIRED_FILES = (
+    ".env",
+    "main.py",
+    "models/user.py",
+    "models/agent_state.py",
+    "utils/telegram_bot.py",
+    "utils/google_calendar.py",
+    "data/users/alex",
+)
+
+_MODULES = (
+    "models.user",
+    "models.agent_state",
+    "utils.telegram_bot",
+    "utils.google_calendar",
+    "utils.scheduler",
+    "nodes.planning",
+    "nodes.checkins",
+    "nodes.interrupts",
+    "prompts.system_prompt",
+    "prompts.phase_prompts",
+)
+
+# Third-party packages the app needs; the Google client libraries are only
+# imported by utils.google_calendar on first use, so they're checked directly
+_DEPENDENCIES = (
+    "openai",
+    "langgraph",
+    "telegram",
+    "googleapiclient.discovery",
+    "google_auth_oauthlib.flow",
+)
+
+# Environment variables the checks read, captured once .env is loaded
+_ENV_SNAPSHOT = {var: os.environ.get(var) for var in _REQUIRED_ENV}
+
+# Set by --quiet; drops the per-module lines from test_basic_imports
+_QUIET = False
+
+# Last Google Calendar availability result, stored as
+# "<credentials mtime> <token mtime> <0|1>"
+_CALENDAR_CACHE_FILE = "data/users/alex/.gcal_available"
+
+
+def _calendar_cache_key(credentials_path, token_path) -> str:
+    """Modification times of the calendar credential files, "-" if missing"""
+    parts = []
+    for path in (credentials_path, token_path):
+        try:
+            parts.append(str(os.stat(path).st_mtime_ns))
+        except OSError:
+            parts.append("-")
+    return " ".join(parts)
+
+
+def _read_calendar_cache(key):
+    """Cached availability for these credential files, or None on a miss"""
+    try:
+        with open(_CALENDAR_CACHE_FILE) as f:
+            cached_key, _, available = f.read().strip().rpartition(" ")
+    except OSError:
+        return None
+    if cached_key != key or available not in ("0", "1"):
+        return None
+    return available == "1"
+
+
+def _write_calendar_cache(key, available: bool):
+    """Remember the availability result; a failed write just means no cache"""
+    try:
+        with open(_CALENDAR_CACHE_FILE, "w") as f:
+            f.write(f"{key} {int(available)}\n")
+    except OSError:
+        pass
+
+
+class _CheckOutput:
+    """sys.stdout stand-in that sends each check thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def isatty(self):
+        # Captured output ends up in a buffer, not on the terminal
+        if getattr(self._local, "buffer", None) is not None:
+            return False
+        return self.stream.isatty()
+    
+    def fileno(self):
+        # Like any in-memory stream, a capturing thread has no descriptor
+        if getattr(self._local, "buffer", None) is not None:
+            raise io.UnsupportedOperation("fileno")
+        return self.stream.fileno()
+    
+    def __getattr__(self, name):
+        # Anything else (encoding, errors, buffer, ...) comes from the real stream
+        if name == "stream":
+            raise AttributeError(name)
+        return getattr(self.stream, name)
+    
+    def capture(self, check):
+        """Run a check, returning its result and everything it printed"""
+        self._local.buffer = io.StringIO()
+        try:
+            try:
+                result = check()
+            except Exception as e:
+                print(f"❌ {check.__name__} failed: {e}")
+                result = False
+            return result, self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
 
 
 def check_environment_variables():
     """Check required environment variables"""
     print("🔐 Checking environment variables...")
     
-    required_vars = [
-        "TELEGRAM_TOKEN",
-        "OPENAI_API_KEY", 
-        "TELEGRAM_CHAT_ID",
-        "TAVILY_API_KEY"
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    get_env = _ENV_SNAPSHOT.get
+    missing_vars = [var for var in _REQUIRED_ENV if not get_env(var)]
     
     if missing_vars:
         print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
@@ -36,19 +171,21 @@ def check_file_structure():
     """Check project file structure"""
     print("\n📁 Checking file structure...")
     
-    required_files = [
-        ".env",
-        "main.py",
-        "models/user.py",
-        "models/agent_state.py",
-        "utils/telegram_bot.py",
-        "utils/google_calendar.py",
-        "data/users/alex"
-    ]
-    
+    # List each parent directory once instead of stat-ing every path
+    listings = {}
     missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
+    # Bound once so the loop uses a fast local lookup
+    split = os.path.split
+    for file_path in _REQUIRED_FILES:
+        parent, name = split(file_path)
+        parent = parent or "."
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                listings[parent] = set()
+        if name not in listings[parent]:
             missing_files.append(file_path)
     
     if missing_files:
@@ -63,26 +200,35 @@ def check_google_calendar_setup():
     """Check Google Calendar setup"""
     print("\n📅 Checking Google Calendar setup...")
     
+    if os.environ.get("GOOGLE_CALENDAR_DISABLED", "").strip().lower() in {"1", "true", "yes"}:
+        print("⚠️  Google Calendar check skipped (GOOGLE_CALENDAR_DISABLED is set)")
+        return True
+    
     credentials_path = "data/users/alex/google_credentials.json"
+    token_path = "data/users/alex/google_token.json"
     
-    if Path(credentials_path).exists():
+    if os.path.exists(credentials_path):
         print("✅ Google Calendar credentials file found")
         
-        # Try to initialize calendar manager
-        try:
-            from utils.google_calendar import GoogleCalendarManager
-            manager = GoogleCalendarManager("alex")
-            
-            if manager.is_available():
-                print("✅ Google Calendar is properly configured and accessible")
-                return True
-            else:
-                print("⚠️  Google Calendar credentials found but not authorized yet")
-                print("   Use /calendar command in Telegram to complete authorization")
-                return True
-        except Exception as e:
-            print(f"❌ Error initializing Google Calendar: {e}")
-            return False
+        # Skip the OAuth setup when neither credential file changed since
+        # the last run
+        available = _read_calendar_cache(_calendar_cache_key(credentials_path, token_path))
+        if available is None:
+            try:
+                from utils.google_calendar import GoogleCalendarManager
+                available = GoogleCalendarManager("alex").is_available()
+            except Exception as e:
+                print(f"❌ Error initializing Google Calendar: {e}")
+                return False
+            # Keyed after the setup, which may have refreshed the token
+            _write_calendar_cache(_calendar_cache_key(credentials_path, token_path), available)
+        
+        if available:
+            print("✅ Google Calendar is properly configured and accessible")
+        else:
+            print("⚠️  Google Calendar credentials found but not authorized yet")
+            print("   Use /calendar command in Telegram to complete authorization")
+        return True
     else:
         print("⚠️  Google Calendar not set up (optional)")
         print(f"   To set up: save OAuth credentials to {credentials_path}")
@@ -90,31 +236,31 @@ def check_google_calendar_setup():
 
 
 def test_basic_imports():
-    """Test that all modules can be imported"""
+    """Test that all modules can be found and imported"""
     print("\n📦 Testing module imports...")
     
-    modules_to_test = [
-        "models.user",
-        "models.agent_state", 
-        "utils.telegram_bot",
-        "utils.google_calendar",
-        "utils.scheduler",
-        "nodes.planning",
-        "nodes.checkins",
-        "nodes.interrupts",
-        "prompts.system_prompt",
-        "prompts.phase_prompts"
-    ]
-    
     failed_imports = []
-    for module in modules_to_test:
+    lines = []
+    _find, _import, add_line = find_spec, import_module, lines.append
+    for module in _DEPENDENCIES + _MODULES:
         try:
-            __import__(module)
-            print(f"✅ {module}")
-        except ImportError as e:
-            print(f"❌ {module}: {e}")
+            # find_spec is the cheap presence check; importing then runs the
+            # module, so missing packages (openai, langgraph, googleapiclient)
+            # and syntax errors fail here rather than at startup
+            if _find(module) is None:
+                raise ImportError(f"No module named '{module}'")
+            _import(module)
+            if not _QUIET:
+                add_line(f"✅ {module}")
+        except Exception as e:
+            if not _QUIET:
+                add_line(f"❌ {module}: {e}")
             failed_imports.append(module)
     
+    # One write for the whole list instead of a print per module
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+    
     if failed_imports:
         print(f"\n❌ Failed to import: {', '.join(failed_imports)}")
         return False
@@ -131,8 +277,10 @@ def test_user_creation():
         from models.user import User
         user = User.load_or_create("test_validation_user")
         
-        assert user.profile.user_id == "test_validation_user"
-        assert user.profile.name == "Alex"
+        if user.profile.user_id != "test_validation_user":
+            raise AssertionError(f"unexpected user id {user.profile.user_id!r}")
+        if user.profile.name != "Alex":
+            raise AssertionError(f"unexpected default name {user.profile.name!r}")
         print("✅ User creation works correctly")
         return True
     except Exception as e:
@@ -148,8 +296,10 @@ def test_agent_state():
         from models.agent_state import create_initial_state
         state = create_initial_state("test_user")
         
-        assert state["current_phase"] == "morning_planning"
-        assert state["user_context"]["user_id"] == "test_user"
+        if state["current_phase"] != "morning_planning":
+            raise AssertionError(f"unexpected initial phase {state['current_phase']!r}")
+        if state["user_context"]["user_id"] != "test_user":
+            raise AssertionError("user_id missing from user_context")
         print("✅ Agent state creation works correctly")
         return True
     except Exception as e:
@@ -157,16 +307,23 @@ def test_agent_state():
         return False
 
 
-async def test_telegram_bot_init():
+def test_telegram_bot_init():
     """Test Telegram bot initialization"""
     print("\n📱 Testing Telegram bot initialization...")
     
+    # Without credentials the bot can't be built; say so without importing it
+    if not _ENV_SNAPSHOT.get("TELEGRAM_TOKEN") or not _ENV_SNAPSHOT.get("TELEGRAM_CHAT_ID"):
+        print("❌ Telegram bot initialization skipped: TELEGRAM_TOKEN and TELEGRAM_CHAT_ID must be set")
+        return False
+    
     try:
         from utils.telegram_bot import TelegramBotInterface
         bot = TelegramBotInterface()
         
-        assert bot.token is not None
-        assert bot.chat_id is not None
+        if bot.token is None:
+            raise AssertionError("bot token is not set")
+        if bot.chat_id is None:
+            raise AssertionError("bot chat id is not set")
         print("✅ Telegram bot initializes correctly")
         return True
     except Exception as e:
@@ -180,22 +337,24 @@ def test_scheduler_functionality():
     
     try:
         from utils.scheduler import DailyScheduler, SchedulerState, create_scheduler_for_user
-        from datetime import time
-        from unittest.mock import patch
         
         # Test scheduler creation
         with patch('utils.scheduler.SchedulerState'), \
              patch('utils.scheduler.TelegramBotInterface'):
             scheduler = create_scheduler_for_user("test_user")
-            assert scheduler.user_id == "test_user"
+            if scheduler.user_id != "test_user":
+                raise AssertionError(f"unexpected scheduler user {scheduler.user_id!r}")
         
         # Test schedule manipulation
         scheduler.update_schedule("morning_planning", time(6, 30))
-        assert scheduler.schedule["morning_planning"] == time(6, 30)
+        if scheduler.schedule["morning_planning"] != time(6, 30):
+            raise AssertionError("schedule update was not applied")
         
         # Test phase progression
-        assert scheduler.get_next_phase("morning_planning") == "morning_checkin"
-        assert scheduler.get_next_phase("nighttime_planning") == "morning_planning"
+        if scheduler.get_next_phase("morning_planning") != "morning_checkin":
+            raise AssertionError("wrong phase after morning_planning")
+        if scheduler.get_next_phase("nighttime_planning") != "morning_planning":
+            raise AssertionError("wrong phase after nighttime_planning")
         
         print("✅ Scheduler functionality works correctly")
         return True
@@ -204,26 +363,37 @@ def test_scheduler_functionality():
         return False
 
 
-async def main():
+def main():
     """Run all validation checks"""
     print("🧪 Personal AI Assistant - Setup Validation")
     print("=" * 50)
     
-    # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
-    
     checks = [
-        check_environment_variables(),
-        check_file_structure(),
-        test_basic_imports(),
-        test_user_creation(),
-        test_agent_state(),
-        await test_telegram_bot_init(),
-        test_scheduler_functionality(),
-        check_google_calendar_setup()
+        check_environment_variables,
+        check_file_structure,
+        test_basic_imports,
+        test_user_creation,
+        test_agent_state,
+        test_telegram_bot_init,
+        test_scheduler_functionality,
+        check_google_calendar_setup
     ]
     
+    # The checks are independent and mostly wait on the filesystem and
+    # imports, so run them side by side; each one's output is buffered and
+    # printed in the usual order afterwards
+    output = _CheckOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            outcomes = list(pool.map(output.capture, checks))
+    finally:
+        sys.stdout = output.stream
+    
+    for _, text in outcomes:
+        sys.stdout.write(text)
+    checks = [result for result, _ in outcomes]
+    
     passed_checks = sum(checks)
     total_checks = len(checks)
     
@@ -243,4 +413,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--quiet", action="store_true",
+                        help="skip the per-module import lines (missing modules are still summarised)")
+    _QUIET = parser.parse_args().quiet
+    sys.exit(main())